@@ -0,0 +1,298 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray, batch_gcd, quantize
+from eisenstein_poly import EisensteinPoly
+from eisenstein_primes import parallel_eisenstein_primes
+
+# Usage: python benchmark.py gcd [sizes...]
+#    e.g. python benchmark.py gcd 10000 100000 1000000
+#        python benchmark.py scalar
+#        python benchmark.py biggcd [bits...]
+#        python benchmark.py startup [modules...]
+#        python benchmark.py parallel [--max-norm N] [--workers W...] [--shard-size S]
+#        python benchmark.py suite [--save FILE] [--compare FILE] [--tolerance T]
+#                                  [--repeat R] [--filter TEXT]
+#
+# The suite times every hot path at several input sizes and can save the
+# results as a JSON baseline. --compare reruns it against a baseline and
+# exits with status 1 when a case got slower by more than the tolerance
+# (0.25 = 25%). Everything runs offline; plots are written to a temporary
+# directory with the Agg backend.
+
+def random_pairs(n, bound=10**6, seed=0):
+    rng = np.random.default_rng(seed)
+    a = EisensteinArray(rng.integers(-bound, bound, n), rng.integers(-bound, bound, n))
+    b = EisensteinArray(rng.integers(-bound, bound, n), rng.integers(-bound, bound, n))
+    return a, b
+
+def timed(f, *args):
+    start = time.perf_counter()
+    result = f(*args)
+    return time.perf_counter() - start, result
+
+def scalar_gcd(a, b):
+    return [x.gcd(y).canonical() for x, y in zip(a.to_list(), b.to_list())]
+
+def bench_gcd(n):
+    a, b = random_pairs(n)
+
+    scalar_time, expected = timed(scalar_gcd, a, b)
+    batch_time, result = timed(batch_gcd, a, b)
+
+    assert result.to_list() == expected
+
+    print("gcd n={:>8}  scalar {:8.3f}s  batch {:8.3f}s  speedup {:6.1f}x".format(
+        n, scalar_time, batch_time, scalar_time / batch_time))
+
+def bench_scalar(number=200000):
+    # Per-operation cost of the scalar EisensteinInt methods
+    x = EisensteinInt(1234, -567)
+    y = EisensteinInt(-89, 31)
+
+    operations = [
+        ("EisensteinInt(a, b)", lambda: EisensteinInt(1234, -567)),
+        ("x + y", lambda: x + y),
+        ("x + 1", lambda: x + 1),
+        ("x - y", lambda: x - y),
+        ("x * y", lambda: x * y),
+        ("x * 2", lambda: x * 2),
+        ("x // y", lambda: x // y),
+        ("divmod(x, y)", lambda: divmod(x, y)),
+        ("x.norm()", lambda: x.norm()),
+        ("x.conjugate()", lambda: x.conjugate()),
+        ("units()", lambda: EisensteinInt.units()),
+        ("x.associates()", lambda: x.associates()),
+        ("x.canonical()", lambda: x.canonical()),
+        ("x.gcd(y)", lambda: x.gcd(y)),
+    ]
+
+    for name, f in operations:
+        seconds = min(timeit.repeat(f, number=number, repeat=3))
+        print("{:<20} {:8.1f} ns/op".format(name, seconds / number * 1e9))
+
+def random_big(bits, rng):
+    half = 1 << (bits - 1)
+    return EisensteinInt(rng.getrandbits(bits) - half, rng.getrandbits(bits) - half)
+
+def euclid_gcd(a, b):
+    if (a.norm() < b.norm()):
+        a, b = b, a
+    while (b.norm() > 0):
+        q, r = divmod(a, b)
+        a, b = b, r
+    return a
+
+def bench_big_gcd(bits):
+    # Plain Euclid against Lehmer on operands sharing a common factor
+    rng = random.Random(bits)
+    c = random_big(bits // 4, rng)
+    a = c * random_big(bits, rng)
+    b = c * random_big(bits, rng)
+
+    euclid_time, expected = timed(euclid_gcd, a, b)
+    lehmer_time, result = timed(a.lehmer_gcd, b)
+
+    assert result.canonical() == expected.canonical()
+
+    print("gcd bits={:>6}  euclid {:8.4f}s  lehmer {:8.4f}s  speedup {:6.1f}x".format(
+        bits, euclid_time, lehmer_time, euclid_time / lehmer_time))
+
+def import_time(module):
+    # Cumulative import time in microseconds, from python -X importtime run
+    # next to this file so the modules are found from any directory
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    for line in result.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+
+def bench_startup(module, repeat=5):
+    us = min(import_time(module) for i in range(repeat))
+    print("import {:<20} {:10.1f} ms".format(module, us / 1000))
+
+def bench_parallel(max_norm, workers, shard_size):
+    # Prime enumeration on a process pool against one worker
+    base = None
+    for w in workers:
+        seconds, count = timed(lambda: sum(len(shard) for shard in parallel_eisenstein_primes(max_norm, workers=w, shard_size=shard_size)))
+        base = base or seconds
+        print("primes norm<={}  workers {:>3}  {:8.3f}s  {} primes  speedup {:5.2f}x".format(
+            max_norm, w, seconds, count, base / seconds))
+
+def suite_cases(plot_dir):
+    # (name, function) for each hot path and input size
+
+    cases = []
+    for bits in [16, 64, 1024]:
+        rng = random.Random(bits)
+        x = random_big(bits, rng)
+        y = random_big(max(bits // 2, 2), rng)
+        cases += [
+            ("floordiv/{}bit".format(bits), lambda x=x, y=y: x // y),
+            ("divmod/{}bit".format(bits), lambda x=x, y=y: divmod(x, y)),
+            ("canonical/{}bit".format(bits), lambda x=x: x.canonical()),
+            ("gcd/{}bit".format(bits), lambda x=x, y=y: x.gcd(y)),
+        ]
+
+    for bits in [4096]:
+        rng = random.Random(bits)
+        x = random_big(bits, rng)
+        y = random_big(bits, rng)
+        cases.append(("gcd/{}bit".format(bits), lambda x=x, y=y: x.gcd(y)))
+
+    for bits in [8, 32, 62]:
+        rng = random.Random(bits)
+        points = [random_big(bits // 2, rng) for i in range(100)]
+        cases.append(("is_prime/{}bit-x100".format(bits), lambda points=points: [p.is_prime() for p in points]))
+
+    for n in [5, 20, 80]:
+        x = EisensteinInt(2, -3)
+        cases.append(("get_multiples/n={}".format(n), lambda x=x, n=n: x.get_multiples(n)))
+
+    for n in [2, 4, 8]:
+        cases.append(("generate_eisenstein_ints/n={}".format(n), lambda n=n: EisensteinInt.generate_eisenstein_ints(n)))
+
+    for n in [10, 100]:
+        cases.append(("hex_disk/n={}".format(n), lambda n=n: list(EisensteinInt.hex_disk(n))))
+
+    for n in [10**3, 10**6]:
+        rng = np.random.default_rng(n)
+        z = rng.standard_normal(n) * 100 + 1j * rng.standard_normal(n) * 100
+        cases.append(("quantize/n={}".format(n), lambda z=z: quantize(z)))
+
+    for n in [10**3, 10**5]:
+        rng = np.random.default_rng(n)
+        f = EisensteinPoly(EisensteinArray(rng.integers(-10**6, 10**6, n), rng.integers(-10**6, 10**6, n)))
+        cases.append(("poly_mul/n={}".format(n), lambda f=f: f * f))
+
+    for n in [10**3, 10**5]:
+        a, b = random_pairs(n)
+        cases += [
+            ("array_divmod/n={}".format(n), lambda a=a, b=b: divmod(a, b)),
+            ("batch_gcd/n={}".format(n), lambda a=a, b=b: batch_gcd(a, b)),
+        ]
+
+    file_name = os.path.join(plot_dir, "plot")
+    cases += [
+        ("plot_all/n=8", lambda: EisensteinInt.plot_all(n=8, primes=True, file_name=file_name)),
+        ("plot_all/n=300", lambda: EisensteinInt.plot_all(n=300, primes=True, file_name=file_name)),
+        ("plot_multiples/n=10", lambda: EisensteinInt(2, 19).plot_multiples(n=10, labels=False, file_name=file_name)),
+    ]
+
+    return cases
+
+def run_suite(repeat=5, text=""):
+    # Seconds per call of each case, the best of repeat runs
+    import matplotlib
+    matplotlib.use("Agg")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as plot_dir:
+        for name, f in suite_cases(plot_dir):
+            if text not in name:
+                continue
+            timer = timeit.Timer(f)
+            number, seconds = timer.autorange()
+            seconds = min([seconds] + timer.repeat(repeat=repeat - 1, number=number))
+            results[name] = seconds / number
+            print("{:<36} {:14.3f} us".format(name, results[name] * 1e6))
+
+    return results
+
+def compare(baseline, results, tolerance):
+    # Prints each case against the baseline, returns the regressed cases
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - tolerance:
+            flag = "faster"
+        print("{:<36} {:14.3f} us {:14.3f} us {:7.2f}x  {}".format(
+            name, baseline[name] * 1e6, seconds * 1e6, ratio, flag))
+    return regressions
+
+def bench_suite(save="", baseline_file="", tolerance=0.25, repeat=5, text=""):
+    results = run_suite(repeat, text)
+
+    if save != "":
+        data = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }
+        with open(save, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    if baseline_file != "":
+        with open(baseline_file) as f:
+            baseline = json.load(f)["results"]
+        print()
+        regressions = compare(baseline, results, tolerance)
+        if regressions:
+            print("{} regression(s) beyond {:.0%}: {}".format(len(regressions), tolerance, ", ".join(regressions)))
+            return 1
+
+    return 0
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(description="Eisenstein integer benchmarks")
+    commands = parser.add_subparsers(dest="command")
+
+    gcd = commands.add_parser("gcd", help="batch_gcd against the scalar gcd")
+    gcd.add_argument("sizes", nargs="*", type=int, default=[10**4, 10**5, 10**6])
+
+    commands.add_parser("scalar", help="cost per scalar operation")
+
+    big = commands.add_parser("biggcd", help="Lehmer against Euclid on large coefficients")
+    big.add_argument("bits", nargs="*", type=int, default=[256, 1024, 4096, 16384])
+
+    startup = commands.add_parser("startup", help="import time of the modules")
+    startup.add_argument("modules", nargs="*", default=["eisenstein", "eisenstein_array", "eisenstein_plot"])
+
+    parallel = commands.add_parser("parallel", help="prime enumeration on a process pool")
+    parallel.add_argument("--max-norm", type=int, default=10**8)
+    parallel.add_argument("--workers", nargs="*", type=int, default=sorted({1, 2, 4, os.cpu_count()}))
+    parallel.add_argument("--shard-size", type=int, default=10**7)
+
+    suite = commands.add_parser("suite", help="time every hot path, save or compare a JSON baseline")
+    suite.add_argument("--save", default="", help="write the results to this JSON file")
+    suite.add_argument("--compare", default="", help="compare against this JSON baseline")
+    suite.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    suite.add_argument("--repeat", type=int, default=5)
+    suite.add_argument("--filter", default="", help="only run the cases whose name contains this")
+
+    args = parser.parse_args()
+
+    if args.command == "gcd" or args.command is None:
+        for n in getattr(args, "sizes", [10**4, 10**5, 10**6]):
+            bench_gcd(n)
+    elif args.command == "scalar":
+        bench_scalar()
+    elif args.command == "startup":
+        for module in args.modules:
+            bench_startup(module)
+    elif args.command == "biggcd":
+        for bits in args.bits:
+            bench_big_gcd(bits)
+    elif args.command == "parallel":
+        bench_parallel(args.max_norm, args.workers, args.shard_size)
+    elif args.command == "suite":
+        sys.exit(bench_suite(args.save, args.compare, args.tolerance, args.repeat, args.filter))
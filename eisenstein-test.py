@@ -1,7 +1,18 @@
+import copy
+import pickle
+import random
+import subprocess
+import sys
 import unittest
 from eisenstein import EisensteinInt
 
 class EisensteinIntTest(unittest.TestCase):
+    def test_lazy_imports(self):
+        # The arithmetic core loads without the heavy dependencies
+        code = "import sys, eisenstein; print(sorted(m for m in ('numpy', 'sympy', 'matplotlib', 'mpmath') if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
     def test_add(self):
         self.assertEqual(EisensteinInt(1,0) + EisensteinInt(1,0), EisensteinInt(2,0))
         self.assertEqual(EisensteinInt(1,-1) + EisensteinInt(1,-1), EisensteinInt(2,-2))
@@ -17,6 +28,27 @@ class EisensteinIntTest(unittest.TestCase):
         self.assertEqual(EisensteinInt(10,-1) - EisensteinInt(1,12), EisensteinInt(9,-13))
         self.assertEqual(EisensteinInt(5,-1) - EisensteinInt(10,-10), EisensteinInt(-5,9))
 
+    def test_int_operands(self):
+        a = EisensteinInt(3,-2)
+        self.assertEqual(a + 2, EisensteinInt(5,-2))
+        self.assertEqual(2 + a, EisensteinInt(5,-2))
+        self.assertEqual(a - 2, EisensteinInt(1,-2))
+        self.assertEqual(2 - a, EisensteinInt(-1,2))
+        self.assertEqual(a * 3, EisensteinInt(9,-6))
+        self.assertEqual(3 * a, EisensteinInt(9,-6))
+        self.assertEqual(-a, EisensteinInt(-3,2))
+        self.assertEqual(a // 2, a // EisensteinInt(2))
+        self.assertEqual(divmod(a, 2), divmod(a, EisensteinInt(2)))
+
+    def test_pow(self):
+        a = EisensteinInt(2,-3)
+        self.assertEqual(a ** 0, EisensteinInt(1))
+        self.assertEqual(a ** 1, a)
+        self.assertEqual(a ** 5, a * a * a * a * a)
+
+        m = EisensteinInt(4,9)
+        self.assertEqual((pow(a, 7, m) - (a ** 7)) % m, EisensteinInt(0))
+
     def test_is_prime(self):
         # Test whether a number is an Eisenstein prime
         self.assertTrue(EisensteinInt(1,-1).is_prime())
@@ -25,11 +57,30 @@ class EisensteinIntTest(unittest.TestCase):
         self.assertTrue(EisensteinInt(1,2).is_prime())
         self.assertTrue(EisensteinInt(-2,-1).is_prime())
         self.assertTrue(EisensteinInt(-3,1).is_prime())
-        self.assertFalse(EisensteinInt(-2,-2).is_prime())
+        # -2-2ω = 2ω^2 is an associate of 2
+        self.assertTrue(EisensteinInt(-2,-2).is_prime())
+        self.assertTrue(EisensteinInt(-2,0).is_prime())
+        self.assertFalse(EisensteinInt(-2,-4).is_prime())
         self.assertFalse(EisensteinInt(1,0).is_prime())
         self.assertFalse(EisensteinInt(3,0).is_prime())
         self.assertFalse(EisensteinInt(7,0).is_prime())
 
+    def test_is_prime_associates(self):
+        for x in EisensteinInt.hex_disk(12):
+            self.assertEqual({a.is_prime() for a in x.associates()}, {x.canonical().is_prime()})
+
+        # p≡1 mod 3 splits, p≡2 mod 3 stays prime
+        self.assertFalse(EisensteinInt(2**61 - 1).is_prime())
+        self.assertTrue(EisensteinInt.split_prime(2**61 - 1).is_prime())
+        self.assertTrue((EisensteinInt(1099511627609) * EisensteinInt(0,1)).is_prime())
+        p = 18446744073709551557  # largest prime below 2^64
+        self.assertTrue(EisensteinInt.is_rational_prime(p))
+        self.assertFalse(EisensteinInt.is_rational_prime(3825123056546413051))  # strong pseudoprime to bases 2..23
+        self.assertTrue(EisensteinInt.is_rational_prime(2**89 - 1))
+
+        # No Eisenstein integer has norm 2 or 5, 2 and 5 are inert
+        self.assertEqual([n for n in range(30) if EisensteinInt.is_prime_norm(n)], [3, 4, 7, 13, 19, 25])
+
     def test_units(self):
         # Test that units are generated
         units = EisensteinInt.units()
@@ -40,6 +91,17 @@ class EisensteinIntTest(unittest.TestCase):
         self.assertEqual(EisensteinInt(-1,-1), units[4])
         self.assertEqual(EisensteinInt(0,-1), units[5])
 
+    def test_immutable(self):
+        # units() and canonical() hand out shared instances
+        unit = EisensteinInt.units()[0]
+        with self.assertRaises(AttributeError):
+            unit.real = 5
+        with self.assertRaises(AttributeError):
+            del EisensteinInt(3,1).canonical().imaginary
+        self.assertEqual(EisensteinInt.units()[0], EisensteinInt(1,0))
+        self.assertEqual(pickle.loads(pickle.dumps(EisensteinInt(3,-7))), EisensteinInt(3,-7))
+        self.assertEqual(copy.copy(EisensteinInt(2,1)), EisensteinInt(2,1))
+
     def test_conjugate(self):
         self.assertEqual(EisensteinInt(0,1).conjugate(), EisensteinInt(-1,-1))
         self.assertEqual(EisensteinInt(1,0).conjugate(), EisensteinInt(1,0))
@@ -129,6 +191,19 @@ class EisensteinIntTest(unittest.TestCase):
 
         self.assertEqual(a,e)
 
+    def test_eisenstein_form_nearest(self):
+        # 0.45 + 0.7i is nearest to ω + 1, rounding both coefficients gives 1
+        c = complex(0.45, 0.7)
+        self.assertEqual(EisensteinInt.eisenstein_form(c), EisensteinInt(1,1))
+
+        random.seed(5)
+        points = list(EisensteinInt.hex_disk(8))
+        for i in range(200):
+            c = complex(random.uniform(-5, 5), random.uniform(-5, 5))
+            e = EisensteinInt.eisenstein_form(c)
+            nearest = min(abs(p.complex_form() - c) for p in points)
+            self.assertAlmostEqual(abs(e.complex_form() - c), nearest)
+
     def test_conjugate_is_prime(self):
         self.assertTrue(EisensteinInt(-3,1).is_prime())
         self.assertTrue(EisensteinInt(-3,1).conjugate().is_prime())
@@ -305,5 +380,174 @@ class EisensteinIntTest(unittest.TestCase):
 
         self.assertEqual(a.gcd(b).canonical(),p.canonical())
 
+    def test_canonical(self):
+        for x in EisensteinInt.hex_disk(10):
+            c = x.canonical()
+            self.assertIn(c, x.associates())
+            if x != EisensteinInt(0,0):
+                self.assertTrue(c.real > c.imaginary >= 0)
+                self.assertEqual(c, [a for a in x.associates() if a.sextant() == EisensteinInt(1,0)][0])
+        self.assertEqual(EisensteinInt(0,0).canonical(), EisensteinInt(0,0))
+
+    def test_of_norm(self):
+        points = list(EisensteinInt.norm_disk(300))
+        for n in range(-2, 301):
+            expected = set(x for x in points if x.norm() == n)
+            result = EisensteinInt.of_norm(n)
+            self.assertEqual(len(result), len(expected))
+            self.assertEqual(set(result), expected)
+            self.assertEqual(EisensteinInt.count_of_norm(n), len(expected))
+
+        self.assertEqual(EisensteinInt.of_norm(7)[:6], EisensteinInt(3,1).associates())
+        self.assertEqual(EisensteinInt.count_of_norm(7**3 * 13 * 3 * 4), 6 * 4 * 2)
+        self.assertEqual(EisensteinInt.count_of_norm(10**18 + 1), len(EisensteinInt.of_norm(10**18 + 1)))
+
+    def test_xgcd(self):
+        random.seed(2)
+        pairs = [(EisensteinInt(12,3), EisensteinInt(4,5)), (EisensteinInt(7,0), EisensteinInt(0,0)),
+                 (EisensteinInt(0,0), EisensteinInt(-3,2)), (EisensteinInt(3,1), 6)]
+        for i in range(20):
+            c = EisensteinInt(random.randint(-50, 50), random.randint(-50, 50))
+            pairs.append((c * EisensteinInt(random.randint(-10**6, 10**6), random.randint(-10**6, 10**6)),
+                          c * EisensteinInt(random.randint(-10**6, 10**6), random.randint(-10**6, 10**6))))
+
+        for a, b in pairs:
+            g, s, t = a.xgcd(b)
+            self.assertEqual(s*a + t*b, g)
+            self.assertEqual(g.norm(), EisensteinInt.gcd(a, EisensteinInt(b) if isinstance(b, int) else b).norm())
+
+    def test_lehmer_gcd(self):
+        random.seed(0)
+        for bits in [64, 300, 1000, 3000]:
+            c = EisensteinInt(random.getrandbits(bits//4), -random.getrandbits(bits//4))
+            a = c * EisensteinInt(random.getrandbits(bits), random.getrandbits(bits))
+            b = c * EisensteinInt(-random.getrandbits(bits), random.getrandbits(bits))
+
+            g = a.lehmer_gcd(b)
+            self.assertEqual(g.canonical(), EisensteinInt.gcd(a, b).canonical())
+            self.assertEqual(g.canonical(), a.lehmer_gcd(b, digit=64).canonical())
+            self.assertEqual(a % g, EisensteinInt(0,0))
+            self.assertEqual(b % g, EisensteinInt(0,0))
+
+        self.assertEqual(EisensteinInt(12,0).lehmer_gcd(EisensteinInt(6,0)).canonical(), EisensteinInt(6,0).canonical())
+
+    def test_primary(self):
+        for a in [EisensteinInt(3,1), EisensteinInt(-7,5), EisensteinInt(2,0), EisensteinInt(1,0)]:
+            u, p = a.primary()
+            self.assertTrue(u.is_unit())
+            self.assertEqual(u * p, a)
+            self.assertEqual(p.real % 3, 2)
+            self.assertEqual(p.imaginary % 3, 0)
+
+    def test_cubic_residue(self):
+        # Euler's criterion: (a/π)_3 ≡ a^((Norm(π)-1)/3) mod π
+        random.seed(1)
+        for pi in [EisensteinInt(3,1), EisensteinInt(2,0), EisensteinInt(7,3), EisensteinInt(-4,-1), EisensteinInt(9,1)]:
+            assert(pi.is_prime())
+            for i in range(30):
+                a = EisensteinInt(random.randint(-100, 100), random.randint(-100, 100))
+                self.assertEqual((pow(a, (pi.norm() - 1) // 3, pi) - a.cubic_residue(pi)) % pi, EisensteinInt(0))
+
+        # Multiplicative in the modulus
+        p = EisensteinInt(3,1)
+        q = EisensteinInt(7,3)
+        for i in range(30):
+            a = EisensteinInt(random.randint(-100, 100), random.randint(-100, 100))
+            self.assertEqual(a.cubic_residue(p*q), a.cubic_residue(p) * a.cubic_residue(q))
+
+        self.assertEqual(EisensteinInt(14,6).cubic_residue(EisensteinInt(7,3)), EisensteinInt(0))
+        self.assertEqual(EisensteinInt(1,-1).cubic_residue(EisensteinInt(2,0)), EisensteinInt(-1,-1))
+
+    def test_hex_disk(self):
+        for n in [0, 1, 4]:
+            box = set()
+            for a in range(-n, n + 1):
+                for b in range(-n, n + 1):
+                    if max(abs(a), abs(b), abs(a - b)) <= n:
+                        box.add(EisensteinInt(a, b))
+
+            points = list(EisensteinInt.hex_disk(n))
+            self.assertEqual(len(points), 3*n*(n+1) + 1)
+            self.assertEqual(set(points), box)
+
+            canonical = list(EisensteinInt.hex_disk(n, sextant=0))
+            self.assertEqual(set(canonical), set(p.canonical() for p in box if p != EisensteinInt(0)))
+            self.assertEqual(len(canonical), n*(n+1) // 2)
+
+        self.assertEqual(set(EisensteinInt.hex_disk(1)), set(EisensteinInt.units() + [EisensteinInt(0)]))
+
+    def test_ring_and_ball(self):
+        ring = list(EisensteinInt(1).ring(2))
+        self.assertEqual(ring[:3], [EisensteinInt(2,0), EisensteinInt(2,1), EisensteinInt(2,2)])
+        self.assertEqual(len(ring), 12)
+
+        a = EisensteinInt(2,-3)
+        for n in [0, 1, 3]:
+            ball = list(a.ball(n))
+            self.assertEqual(ball, [m for k in range(n + 1) for m in a.ring(k)])
+            self.assertEqual(set(ball), set(a * z for z in EisensteinInt.hex_disk(n)))
+            self.assertEqual(len(ball), len(set(ball)))
+
+    def test_get_multiples(self):
+        a = EisensteinInt(-2,5)
+        for n in [1, 2, 4]:
+            multiples = a.get_multiples(n)
+            self.assertEqual(len(multiples), 3*n*(n+1))
+            self.assertEqual(set(multiples), set(a * z for z in EisensteinInt.hex_disk(n) if z != EisensteinInt(0)))
+        self.assertEqual(set(EisensteinInt(1).get_multiples(1)), set(EisensteinInt.units()))
+
+    def test_norm_disk(self):
+        for N in [-4, -1, 0, 1, 3, 7, 50]:
+            box = set()
+            for a in range(-10, 11):
+                for b in range(-10, 11):
+                    if EisensteinInt(a, b).norm() <= N:
+                        box.add(EisensteinInt(a, b))
+
+            points = list(EisensteinInt.norm_disk(N))
+            self.assertEqual(len(points), len(box))
+            self.assertEqual(set(points), box)
+
+            for k in range(6):
+                sextant = list(EisensteinInt.norm_disk(N, sextant=k))
+                self.assertEqual(set(sextant), set(p for p in box if p.sextant() == EisensteinInt.units()[k]))
+
+    def assertFactorization(self, a):
+        unit, factors = a.factor()
+        self.assertTrue(unit.is_unit())
+
+        product = unit
+        for p, e in factors.items():
+            self.assertEqual(p, p.canonical())
+            self.assertTrue(p.is_prime())
+            for i in range(e):
+                product = product * p
+        self.assertEqual(product, a)
+
+    def test_factor(self):
+        p=EisensteinInt(3,1)
+        q=EisensteinInt(1,-1)
+        r=EisensteinInt(2,0)
+
+        unit, factors = (p*p*q*r).factor()
+        self.assertEqual(factors, {q.canonical(): 1, r: 1, p.canonical(): 2})
+
+        unit, factors = EisensteinInt(7).factor()
+        self.assertEqual(factors, {EisensteinInt(3,1): 1, EisensteinInt(3,2): 1})
+
+        unit, factors = EisensteinInt(0,-1).factor()
+        self.assertEqual(unit, EisensteinInt(0,-1))
+        self.assertEqual(factors, {})
+
+        for a in [EisensteinInt(12,0), EisensteinInt(-7,13), EisensteinInt(360,-49),
+                  EisensteinInt(2**31-1, 5), EisensteinInt(-91,-91)]:
+            self.assertFactorization(a)
+
+    def test_split_prime(self):
+        for p in [7, 13, 19, 31, 1000003]:
+            pi = EisensteinInt.split_prime(p)
+            self.assertEqual(pi.norm(), p)
+            self.assertEqual(pi, pi.canonical())
+
 if (__name__ == '__main__'):
     unittest.main()
@@ -1,8 +1,8 @@
-from sympy import isprime, primefactors, factorint, solve, symbols, Symbol, Eq
-from math import sqrt, pi, sin, cos, atan
-import matplotlib.pyplot as plt
-import numpy as np
-import mpmath
+# The arithmetic only needs the standard library. sympy (primality and
+# factoring) and matplotlib/numpy (plotting) are imported on first use.
+from math import sqrt, isqrt, gcd, floor, pi, sin, cos, atan
+from functools import lru_cache
+import os
 
 class EisensteinInt:
     """
@@ -14,7 +14,9 @@ class EisensteinInt:
 
     Functions implemented
          Basic functions: init(), ==, hash(),  str(), <, >, <=, >=
-	     Arithmetic functions: abs(), +, divmod(), //, %, *, -
+	     Arithmetic functions: abs(), +, divmod(), //, %, *, **, pow(), -,
+            unary -
+            (int operands work on either side, e.g. 2 * a or 1 + a)
 
          a.debug_str() - Returns a simple debug string to describe the
             data members.
@@ -22,6 +24,10 @@ class EisensteinInt:
          a.associates() - Returns a list of the product of the number and
             each of the units.
          a.canonical() - Returns the associate in the first sextant.
+         a.associate_key() - Returns an int shared by exactly the associates
+            of a.
+         EisensteinInt.from_associate_key(k) - Returns the canonical
+            EisensteinInt with associate_key() k.
          a.complex_form() - Returns the complex form.
          a.conjugate() - Returns an EisensteinInt representing he conjugate.
          a.dot_product(b) - Returns the dot product.
@@ -30,34 +36,80 @@ class EisensteinInt:
          a.sextant() - Returns the unit in the corresponding sextant.
          a.signum() - Returns a list of the units multiplied by the number.
          EisensteinInt.units() - Returns a list of the 6 Eisenstein units.
-         EisensteinInt.eisenstein_form(c) - Returns the EisensteinInt from.
-            a complex number
+         EisensteinInt.eisenstein_form(c) - Returns the EisensteinInt nearest
+            to a complex number.
+         EisensteinInt.from_string(s) - Returns the EisensteinInt written as
+            str() does, e.g. "3 - 2ω".
 
          a.is_even() - Returns whether or not n is even.
          a.is_prime() - Returns whether or not n is a prime.
+         EisensteinInt.is_prime_norm(n) - Returns whether the EisensteinInt of
+            norm n are prime. Results are cached.
+         EisensteinInt.is_rational_prime(n) - Returns whether the integer n is
+            prime, with Miller-Rabin below 2^64.
          a.is_unit() - Returns whether or not n is a unit.
 
          a.gcd(b) - Compute the greatest common divisor of a and b.
+            Switches to a.lehmer_gcd(b) above lehmer_threshold bits.
+         a.lehmer_gcd(b) - Compute the greatest common divisor of a and b
+            with Lehmer's algorithm, for coefficients of thousands of bits.
+         a.xgcd(b) - Returns (g, s, t) with s*a + t*b = g, a greatest common
+            divisor of a and b.
+         a.bit_length() - Returns the bit length of the largest coefficient.
+         a.factor() - Returns a unit and a dict of canonical primes to
+            exponents whose product is a.
+         a.primary() - Returns a unit u and the associate p ≡ 2 mod 3 with
+            a = u * p.
+         a.cubic_residue(pi) - Returns the cubic residue symbol (a/pi)_3.
+         EisensteinInt.split_prime(p) - Returns the canonical prime above a
+            rational prime p ≡ 1 mod 3. Results are cached.
+         EisensteinInt.of_norm(n) - Returns every EisensteinInt of norm n, each
+            canonical one followed by its associates.
+         EisensteinInt.count_of_norm(n) - Returns r(n), the number of
+            EisensteinInt of norm n.
          a.plot_point(file_name) - Plots a single point in a polar plane.
             Shows plot unless given a file name to save to.
          a.plot_multiples(n,labels, file_name) - Plots the multipls of
             the number n degrees out and gives the option to include labels.
             Shows plot unless given a file name to save to.
          a.get_multiples(n) - Returns a list of multiples n degrees away
+         a.ring(k) - Yields the multiples exactly k degrees away.
+         a.ball(n) - Yields the multiples at most n degrees away, ring by
+            ring, starting with 0.
 
+         EisensteinInt.plot_list(points, primes, labels, file_name) - Plots the
+            points and can highlight the prime numbers. Large lists are drawn
+            as a density raster (see eisenstein_plot.py).
          EisensteinInt.plot_all(n,prime, file_name) - Plots all Eisenstein
-            integers and can highlight the prime numbers. Shows plot unless given
-            a file name to save to.
+            integers within hex distance n and can highlight the prime numbers.
+            Shows plot unless given a file name to save to.
          EisensteinInt.generate_eisenstein_ints(n) - Generates all EisensteinInt
             and their multiples through brute force
+         EisensteinInt.hex_disk(n, sextant) - Yields each EisensteinInt within
+            hex distance n once, optionally only those of one sextant.
+         EisensteinInt.norm_disk(N, sextant) - Yields each EisensteinInt with
+            norm at most N once, optionally only those of one sextant.
     """
 
+    __slots__ = ("real", "imaginary")
+
     def __init__(self, real=0, imaginary=0):
         assert isinstance(real, int)
         assert isinstance(imaginary, int)
 
-        self.real = real
-        self.imaginary = imaginary
+        _set_real(self, real)
+        _set_imaginary(self, imaginary)
+
+    def __setattr__(self, name, value):
+        # Instances are shared (UNITS, ONE, canonical() may return self), so
+        # they are immutable once created
+        raise AttributeError("EisensteinInt is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("EisensteinInt is immutable")
+
+    def __reduce__(self):
+        return (EisensteinInt, (self.real, self.imaginary))
 
     def __hash__(self):
         return hash((self.real, self.imaginary))
@@ -102,7 +154,9 @@ class EisensteinInt:
 
     def __add__(self, other):
         if isinstance(other, int):
-            other = EisensteinInt(other)
+            return _new(self.real + other, self.imaginary)
+        if not isinstance(other, EisensteinInt):
+            return NotImplemented
 
         a = self.real
         b = self.imaginary
@@ -112,37 +166,51 @@ class EisensteinInt:
         sum_real = a + c
         sum_imaginary = b + d
 
-        return EisensteinInt(sum_real, sum_imaginary)
+        return _new(sum_real, sum_imaginary)
+
+    def __radd__(self, other):
+        return self + other
 
     def __divmod__(self, other):
         if isinstance(other, int):
-            other = EisensteinInt(other)
+            other = _new(other, 0)
+        if not isinstance(other, EisensteinInt):
+            return NotImplemented
 
-        assert(other != EisensteinInt())
+        qr, qi = self.__quotient(other)
 
-        a = self
-        b = other
-
-        q = a // b
-        r = a - (q*b)
+        # r = a - q*b
+        c = other.real
+        d = other.imaginary
+        r_real = self.real - ((qr*c)-(qi*d))
+        r_imaginary = self.imaginary - ((qr*d)+qi*(c-d))
 
-        return q,r
+        return _new(qr, qi), _new(r_real, r_imaginary)
 
     def __floordiv__(self, other):
-
         if isinstance(other, int):
-            other = EisensteinInt(other)
+            other = _new(other, 0)
+        if not isinstance(other, EisensteinInt):
+            return NotImplemented
 
-        assert(other != EisensteinInt())
+        qr, qi = self.__quotient(other)
 
-        a = self
-        b = other
+        return _new(qr, qi)
 
-        numerator = a * (b.conjugate())
-        denominator = b.norm()
+    def __quotient(self, other):
+        # Private helper function, the coefficients of the nearest quotient
 
-        nr = numerator.real
-        ni = numerator.imaginary
+        a = self.real
+        b = self.imaginary
+        c = other.real
+        d = other.imaginary
+
+        # a * conjugate(b) = (a+bω)*((c-d)-dω)
+        nr = a*c - a*d + b*d
+        ni = b*c - a*d
+        denominator = c*c - c*d + d*d
+
+        assert(denominator != 0)
 
         qr = nr // denominator
         qi = ni // denominator
@@ -153,15 +221,13 @@ class EisensteinInt:
         if (2*qi+1)*denominator < 2*ni:
             qi += 1
 
-        q = EisensteinInt(qr, qi)
-
-        return q
+        return qr, qi
 
     def divmod_brute_force(self, other):
         if isinstance(other, int):
             other = EisensteinInt(other)
 
-        assert(other != EisensteinInt())
+        assert(other != ZERO)
 
         a = self
         b = other
@@ -175,7 +241,7 @@ class EisensteinInt:
         if isinstance(other, int):
             other = EisensteinInt(other)
 
-        assert(other != EisensteinInt())
+        assert(other != ZERO)
 
         a = self
         b = other
@@ -221,7 +287,7 @@ class EisensteinInt:
 
     def __lt__(self, other):
         if isinstance(other, int):
-            other = EisensteinInt(other)
+            return self.norm() < other*other
 
         return self.norm() < other.norm()
 
@@ -230,7 +296,7 @@ class EisensteinInt:
 
     def __gt__(self, other):
         if isinstance(other, int):
-            other = EisensteinInt(other)
+            return self.norm() > other*other
 
         return self.norm() > other.norm()
 
@@ -245,7 +311,9 @@ class EisensteinInt:
         # (a+bω)*(c+dω)=(ac-bd)+(ad+b(c-d))ω
 
         if isinstance(other, int):
-            other = EisensteinInt(other)
+            return _new(self.real * other, self.imaginary * other)
+        if not isinstance(other, EisensteinInt):
+            return NotImplemented
 
         a = self.real
         b = self.imaginary
@@ -254,11 +322,40 @@ class EisensteinInt:
         product_real = (a*c)-(b*d)
         product_imaginary = (a*d)+b*(c-d)
 
-        return EisensteinInt(product_real, product_imaginary)
+        return _new(product_real, product_imaginary)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __pow__(self, e, modulo=None):
+        # Square and multiply, reducing after each step when given a modulo
+        # (EisensteinMod is faster for repeated modular work)
+
+        assert(e >= 0)
+
+        result = ONE
+        base = self
+        while e > 0:
+            if e & 1:
+                result = result * base
+                if modulo is not None:
+                    result = result % modulo
+            e >>= 1
+            if e > 0:
+                base = base * base
+                if modulo is not None:
+                    base = base % modulo
+
+        return result
+
+    def __neg__(self):
+        return _new(-self.real, -self.imaginary)
 
     def __sub__(self, other):
         if isinstance(other, int):
-            other = EisensteinInt(other)
+            return _new(self.real - other, self.imaginary)
+        if not isinstance(other, EisensteinInt):
+            return NotImplemented
 
         a = self.real
         b = self.imaginary
@@ -268,20 +365,38 @@ class EisensteinInt:
         difference_real = a - c
         difference_imaginary = b - d
 
-        return EisensteinInt(difference_real, difference_imaginary)
+        return _new(difference_real, difference_imaginary)
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return _new(other - self.real, -self.imaginary)
+        return NotImplemented
 
     def associates(self):
-        units = EisensteinInt.units()
-        associates = list(map(lambda x: x * self, units))
+        associates = [u * self for u in UNITS]
         return associates
 
     def canonical(self):
-        associates = self.associates()
+        a, b = _canonical_coefficients(self.real, self.imaginary)
+        if a == self.real and b == self.imaginary:
+            return self
+        return _new(a, b)
+
+    def associate_key(self):
+        # Packs the canonical associate (a, b), 0 <= b < a, into the single
+        # int a(a-1)/2 + b. Associates share a key, zero has key -1.
+        a, b = _canonical_coefficients(self.real, self.imaginary)
+        if a == 0:
+            return -1
+        return a*(a - 1)//2 + b
 
-        for a in associates:
-            # In first sextant
-            if (a.sextant() == EisensteinInt(1)):
-                return a
+    @staticmethod
+    def from_associate_key(key):
+        # The canonical EisensteinInt with the given associate_key()
+        if key < 0:
+            return ZERO
+        t = (isqrt(8*key + 1) - 1) // 2
+        return _new(t + 1, key - t*(t + 1)//2)
 
     def complex_form(self):
         r = self.real
@@ -299,7 +414,7 @@ class EisensteinInt:
 
         conjugate_real = a-b
         conjugate_imag = -b
-        return EisensteinInt(conjugate_real, conjugate_imag)
+        return _new(conjugate_real, conjugate_imag)
 
     def dot_product(self, other):
         a = self.real
@@ -340,7 +455,7 @@ class EisensteinInt:
             if (y != 0):
                 angle = angle + pi
             else:
-                angle = np.pi - angle
+                angle = pi - angle
 
         return (r, angle)
 
@@ -351,38 +466,76 @@ class EisensteinInt:
         a = self.real
         b = self.imaginary
         if (a == 0 and b==0):
-            return (self, EisensteinInt(0)) # origin
+            return (self, ZERO) # origin
         elif (a > b and b >=0):
-            return (self, EisensteinInt(1)) # first
+            return (self, UNITS[0]) # first
         elif (b >= a and a>0):
-            return (self * EisensteinInt(0,-1), EisensteinInt(1,1)) # second
+            return (self * UNITS[5], UNITS[1]) # second
         elif (b > 0 and 0>=a):
-            return (EisensteinInt(-1,-1) * self, EisensteinInt(0,1)) # third
+            return (UNITS[4] * self, UNITS[2]) # third
         elif (a < b and b<=0):
-            return (self * EisensteinInt(-1,0), EisensteinInt(-1)) # fourth
+            return (self * UNITS[3], UNITS[3]) # fourth
         elif (b <= a and a<0):
-            return (self * EisensteinInt(0,1), EisensteinInt(-1,-1)) # fifth
+            return (self * UNITS[2], UNITS[4]) # fifth
         else:
-            return (self * EisensteinInt(1,1), EisensteinInt(0,-1)) # sixth
+            return (self * UNITS[1], UNITS[5]) # sixth
 
     @staticmethod
     def eisenstein_form(c):
+        # The nearest EisensteinInt to the complex number c. Rounding re and
+        # ie separately can miss it, the nearest is one of the 4 corners of
+        # the cell around (re, ie), as in floor_div_brute_force(). Relative to
+        # the corner (0, 0) the squared distance to each corner changes by
+        # the last term below.
+
         r = c.real
         i = c.imag
 
         ie = 2* i / sqrt(3)
         re = r + ((1/2) * ie)
 
-        return EisensteinInt(round(re), round(ie))
+        a = floor(re)
+        b = floor(ie)
+        fa = re - a
+        fb = ie - b
+
+        candidates = [(0, 0, 0), (1, 0, 1 + fb - 2*fa), (0, 1, 1 + fa - 2*fb), (1, 1, 1 - fa - fb)]
+        da, db, d = min(candidates, key=lambda candidate: candidate[2])
+
+        return EisensteinInt(int(a) + da, int(b) + db)
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def text_form():
+        # a, then ± bω, as str() writes them. w is accepted for ω. Compiled
+        # on first use so that importing the module stays cheap.
+        import re
+
+        return re.compile(r"\s*(?:([+-]?\d+)(?![\dωw]))?\s*(?:([+-]?)\s*(\d*)[ωw])?\s*")
+
+    @staticmethod
+    def from_string(text):
+        match = EisensteinInt.text_form().fullmatch(text)
+        if match is None or text.strip() == "":
+            raise ValueError("invalid Eisenstein integer: {!r}".format(text))
+
+        a, sign, b = match.groups()
+        if a is not None and sign == "":
+            # "3 7ω"
+            raise ValueError("invalid Eisenstein integer: {!r}".format(text))
+
+        real = int(a) if a is not None else 0
+        imaginary = 0
+        if sign is not None:
+            imaginary = int(b) if b != "" else 1
+            if sign == "-":
+                imaginary = -imaginary
+
+        return _new(real, imaginary)
 
     @staticmethod
     def units():
-        units = []
-        unit = EisensteinInt(1,0)
-        for i in range(6):
-            units.append(unit)
-            unit = unit * EisensteinInt(1, 1)
-        return units
+        return list(UNITS)
 
     def is_even(self):
         # is_even iff. a+b is congruent to 0 mod 3
@@ -396,34 +549,75 @@ class EisensteinInt:
             return False
 
     def is_prime(self):
-        # n is an eisenstein prime if
-        # 1) b=0 and a=p, prime and p≡2 mod 3
-        # 2) a=0 and b=p, prime and p≡2 mod 3
-        # 3) Norm(n) = p is prime where p=3 or p≡1 mod 3
-
-        a = self.real
-        b = self.imaginary
+        # Primality only depends on the norm, which associates share, so the
+        # answer is cached per norm in is_prime_norm()
+        return EisensteinInt.is_prime_norm(self.norm())
 
-        if (b == 0 and isprime(a) and (a % 3 == 2)):
-            return True
-        if (a == 0 and isprime(b) and (b % 3 == 2)):
+    @staticmethod
+    @lru_cache(maxsize=1 << 16)
+    def is_prime_norm(n):
+        # The Eisenstein integers of norm n are prime if
+        # 1) n = p is prime, p=3 or p≡1 mod 3 (no norm is ≡2 mod 3)
+        # 2) n = p^2 for a prime p≡2 mod 3, they are the associates of p
+        # A prime p≡2 mod 3 such as 2 is not a norm at all, so not prime.
+
+        if n % 3 != 2 and EisensteinInt.is_rational_prime(n):
             return True
 
-        norm = self.norm()
-        is_prime = isprime(norm)
+        p = isqrt(max(n, 0))
+        return p*p == n and p % 3 == 2 and EisensteinInt.is_rational_prime(p)
 
-        if (is_prime):
-            # Norm == 3 is 1-ω
-            return (norm == 3) or (norm % 3 == 1)
-        else:
+    @staticmethod
+    def is_rational_prime(n):
+        # Below SMALL_PRIME_LIMIT a sieve lookup. Otherwise trial division by
+        # the primes below 200 (one gcd with their product), then Miller-Rabin
+        # with the smallest known witness set that has no strong pseudoprime
+        # below n, so the answer is exact for n < 2^64. sympy decides larger n.
+
+        if n < SMALL_PRIME_LIMIT:
+            return n >= 0 and SMALL_PRIMES[n] == 1
+
+        if gcd(n, TRIAL_PRODUCT) != 1:
             return False
 
+        if n >= 1 << 64:
+            from sympy import isprime
+            return isprime(n)
+
+        for bound, witnesses in MILLER_RABIN_WITNESSES:
+            if n < bound:
+                break
+
+        # n - 1 = d * 2^s with d odd
+        s = ((n - 1) & (1 - n)).bit_length() - 1
+        d = (n - 1) >> s
+
+        for a in witnesses:
+            # The witness sets hold for the witnesses modulo n
+            a %= n
+            if a == 0:
+                continue
+            x = pow(a, d, n)
+            if x == 1 or x == n - 1:
+                continue
+            for r in range(s - 1):
+                x = x * x % n
+                if x == n - 1:
+                    break
+            else:
+                return False
+
+        return True
+
     def is_unit(self):
         if (self.norm() == 1):
             return True
         else:
             return False
 
+    # Coefficient size in bits above which gcd() switches to lehmer_gcd()
+    lehmer_threshold = 512
+
     def gcd(self, other):
 
         a = self
@@ -432,131 +626,345 @@ class EisensteinInt:
         if (a.norm() < b.norm()):
             return b.gcd(a)
 
+        if (a.bit_length() > EisensteinInt.lehmer_threshold):
+            return a.lehmer_gcd(b)
+
         while (b.norm() > 0):
             q, r = divmod(a, b)
             a, b = b, r
 
         return a
 
-    def plot_point(self, format="", label="", file_name=""):
-        max_len = 0
+    def xgcd(self, other):
+        # Extended Euclid: returns (g, s, t) with s*a + t*b = g = gcd(a, b)
 
-        length, angle = self.polar_form()
+        if isinstance(other, int):
+            other = _new(other, 0)
 
-        if (length > max_len):
-            max_len = length
+        a = self
+        b = other
+        s0, t0, s1, t1 = ONE, ZERO, ZERO, ONE
 
-        r = self.real
-        i = self.imaginary
+        while (b.norm() > 0):
+            q, r = divmod(a, b)
+            a, b = b, r
+            s0, t0, s1, t1 = s1, t1, s0 - q*s1, t0 - q*t1
 
-        if format != "":
-            plt.polar(angle, length, format)
-        else:
-            plt.polar(angle, length, 'ro')
+        return a, s0, t0
 
-        if label != "":
-            plt.text(angle, length, label, horizontalalignment='center', verticalalignment='bottom')
-        else:
-            plt.text(angle, length, str(self), horizontalalignment='center', verticalalignment='bottom')
+    def bit_length(self):
+        return max(abs(self.real), abs(self.imaginary)).bit_length()
 
-        plt.thetagrids(range(0, 360, 60), ('1', '1+ω', 'ω', '-1', '-ω-1', '-ω'))
-        plt.rgrids(np.arange(0,max_len,max_len/10), labels=[])
+    def lehmer_gcd(self, other, digit=None):
+        # Lehmer's algorithm: run Euclid on the leading digit bits of a and b,
+        # collecting the quotients in a matrix M with det(M) a unit, then apply
+        # M to the full a and b in one go. Euclid on the truncated values is
+        # only trusted while their remainders keep more than half the digit.
+        # By default the digit grows with the operands, n/32 bits but at
+        # least 128.
 
-        if file_name != "":
-            plt.savefig(file_name)
-            plt.clf()
-        else:
-            plt.show()
+        a = self
+        b = other
 
-        return plt
+        if (a.norm() < b.norm()):
+            a, b = b, a
 
-    def plot_multiples(self, n=2, labels=True, file_name=""):
-        max_len = 0
+        while (b.norm() > 0):
+            n = a.bit_length()
+            w = digit or max(128, n // 32)
+            if (n <= w):
+                q, r = divmod(a, b)
+                a, b = b, r
+                continue
+
+            shift = n - w
+            x = _new(a.real >> shift, a.imaginary >> shift)
+            y = _new(b.real >> shift, b.imaginary >> shift)
+
+            # (x, y) ~ (u0*a + v0*b, u1*a + v1*b) / 2^shift
+            u0, v0, u1, v1 = ONE, ZERO, ZERO, ONE
+            steps = 0
+            while (y.bit_length() > w // 2 + 8):
+                q, r = divmod(x, y)
+                x, y = y, r
+                u0, v0, u1, v1 = u1, v1, u0 - q*u1, v0 - q*v1
+                steps += 1
+
+            if steps > 0:
+                c = u0*a + v0*b
+                d = u1*a + v1*b
+                if (c.norm() < d.norm()):
+                    c, d = d, c
+                if (c.norm() < a.norm()):
+                    a, b = c, d
+                    continue
+
+            # The leading digits gave no progress, take one exact step
+            q, r = divmod(a, b)
+            a, b = b, r
 
-        multiples = self.get_multiples(n)
+        return a
 
-        for multiple in multiples:
-            length, angle = multiple.polar_form()
+    def factor(self):
+        # Factors the norm over the rational primes, then finds the
+        # Eisenstein primes above each of them:
+        # 1) p=3 ramifies, 3 = -ω^2(1-ω)^2
+        # 2) p≡2 mod 3 stays prime, with norm p^2
+        # 3) p≡1 mod 3 splits into π and its conjugate, both of norm p
 
-            if (length > max_len):
-                max_len = length
+        from sympy import factorint
 
-            r = multiple.real
-            i = multiple.imaginary
+        assert(self != ZERO)
 
-            if multiple == self:
-                plt.polar(angle, length, 'ro')
+        factors = {}
+        for p, k in sorted(factorint(self.norm()).items()):
+            if p == 3:
+                factors[EisensteinInt(2,1)] = k
+            elif p % 3 == 2:
+                factors[EisensteinInt(p)] = k // 2
             else:
-                plt.polar(angle, length, 'bo')
-            if (labels):
-                plt.text(angle, length, str(multiple), horizontalalignment='center', verticalalignment='bottom')
+                prime = EisensteinInt.split_prime(p)
+                conjugate = prime.conjugate().canonical()
 
-        plt.thetagrids(range(0, 360, 60), ('1', '1+ω', 'ω', '-1', '-ω-1', '-ω'))
-        plt.rgrids(np.arange(0,max_len,max_len/10), labels=[])
+                e = 0
+                n = self
+                while e < k:
+                    q, r = divmod(n, prime)
+                    if r != ZERO:
+                        break
+                    n = q
+                    e += 1
 
-        if file_name != "":
-            plt.savefig(file_name)
-            plt.clf()
-        else:
-            plt.show()
+                if e > 0:
+                    factors[prime] = e
+                if k - e > 0:
+                    factors[conjugate] = k - e
 
-        return plt
+        product = ONE
+        for prime, e in factors.items():
+            for i in range(e):
+                product = product * prime
 
-    def get_multiples(self, n):
-        units = EisensteinInt.units()
+        unit = self // product
+        assert(unit * product == self)
 
-        multiples = units
-        for i in range(1, n):
-            multiples = self.__find_multiples(multiples, units)
-        multiples = list(map(lambda x: x * self,multiples))
-        return multiples
+        return unit, factors
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def split_prime(p):
+        # A primitive cube root of unity w mod p gives p | w^2+w+1 = N(w-ω),
+        # so gcd(p, w-ω) is a prime above p
+
+        assert(p % 3 == 1)
 
-    def __find_multiples(self, multiples, units):
-        # Private helper function
-        rv = set()
-        for i in multiples:
-            for j in units:
-                val = i + j
-                if (val != EisensteinInt(0, 0)):
-                    rv.add(val)
+        g = 2
+        w = 1
+        while w == 1:
+            w = pow(g, (p - 1) // 3, p)
+            g += 1
 
-        return rv
+        return EisensteinInt(p).gcd(EisensteinInt(w, -1)).canonical()
 
     @staticmethod
-    def plot_list(points, primes=False, labels=False, file_name=""):
-        max_len = 0
-        for pt in points:
-            length, angle = pt.polar_form()
+    def of_norm(n):
+        # Every x with Norm(x) = n, built from the factorization of n:
+        # 1) 3^k contributes (1-ω)^k
+        # 2) p^k with p≡2 mod 3 contributes p^(k/2), there is no x for odd k
+        # 3) p^k with p≡1 mod 3 = π*conj(π) contributes π^j * conj(π)^(k-j)
+        #    for each j in 0..k
+        # The canonical products come sorted by coefficients, each followed by
+        # its associates.
+
+        if n <= 0:
+            return [ZERO] if n == 0 else []
+
+        from sympy import factorint
+
+        products = [ONE]
+        for p, k in factorint(n).items():
+            if p == 3:
+                choices = [LAMBDA ** k]
+            elif p % 3 == 2:
+                if k % 2 == 1:
+                    return []
+                choices = [_new(p ** (k // 2), 0)]
+            else:
+                prime = EisensteinInt.split_prime(p)
+                conjugate = prime.conjugate()
+                choices = [prime ** j * conjugate ** (k - j) for j in range(k + 1)]
+            products = [x * y for x in products for y in choices]
+
+        canonical = sorted((x.canonical() for x in products), key=lambda x: (x.real, x.imaginary))
+        return [u * x for x in canonical for u in UNITS]
+
+    @staticmethod
+    def count_of_norm(n):
+        # r(n), the number of x with Norm(x) = n: 6 times the product of k+1
+        # over p^k with p≡1 mod 3, or 0 if some p≡2 mod 3 has an odd exponent
+
+        if n <= 0:
+            return 1 if n == 0 else 0
+
+        from sympy import factorint
+
+        count = 6
+        for p, k in factorint(n).items():
+            if p % 3 == 1:
+                count *= k + 1
+            elif p % 3 == 2 and k % 2 == 1:
+                return 0
+
+        return count
+
+    def primary(self):
+        # Returns (u, p) with self = u * p and p ≡ 2 mod 3, the primary
+        # associate. Defined when 1-ω does not divide self.
+
+        assert(not self.is_even())
+
+        for k in range(6):
+            # UNITS[-k] is the inverse of UNITS[k]
+            p = self * UNITS[-k % 6]
+            if (p.real % 3 == 2 and p.imaginary % 3 == 0):
+                return UNITS[k], p
+
+    def cubic_residue(self, pi):
+        # The cubic residue symbol (self/pi)_3 ≡ self^((Norm(pi)-1)/3) mod pi,
+        # extended multiplicatively to composite pi like the Jacobi symbol.
+        # Returns 1, ω or ω^2, or 0 when self and pi share a factor.
+        #
+        # Computed by descent, with for primary a, b and b = 3m-1 + 3nω:
+        # 1) (a/b) = (a mod b/b)
+        # 2) (a/b) = (b/a), cubic reciprocity
+        # 3) (ω/b) = ω^((Norm(b)-1)/3) and (-1/b) = 1
+        # 4) (1-ω/b) = ω^(2m)
+
+        b = pi.primary()[1]
+        a = self
+        j = 0
 
-            if (length > max_len):
-                max_len = length
+        while (b.norm() > 1):
+            a = a % b
+            if (a == ZERO):
+                return ZERO
 
-            r = pt.real
-            i = pt.imaginary
+            k = 0
+            while a.is_even():
+                a = a // LAMBDA
+                k += 1
 
-            if pt.is_prime():
-                plt.polar(angle, length, 'ro')
-            else:
-                plt.polar(angle, length, 'bo')
-            if (labels):
-                plt.text(angle, length, str(multiple), horizontalalignment='center', verticalalignment='bottom')
+            # UNITS[t] = (1+ω)^t = (-ω^2)^t
+            u, a = a.primary()
+            t = UNITS.index(u)
+            m = (b.real + 1) // 3
+            j += 2*t*((b.norm() - 1) // 3) + 2*m*k
 
-        plt.thetagrids(range(0, 360, 60), ('1', '1+ω', 'ω', '-1', '-ω-1', '-ω'))
-        plt.rgrids(np.arange(0,max_len,max_len/10), labels=[])
+            a, b = b, a
 
+        return CUBE_ROOTS[j % 3]
 
-        if file_name != "":
-            plt.savefig(file_name)
-            plt.clf()
-        else:
-            plt.show()
+    def plot_point(self, format="", label="", file_name=""):
+        from eisenstein_plot import plot_point
+
+        return plot_point(self, format, label, file_name)
+
+    def plot_multiples(self, n=2, labels=True, file_name=""):
+        from eisenstein_array import EisensteinArray
+        from eisenstein_plot import plot_chunks
+
+        # The points of get_multiples(n), built as arrays a chunk of rings at
+        # a time. The corners of ring n have the largest norm, n^2*Norm(self).
+        n = max(n, 1)
+        chunks = lambda: EisensteinArray.ball_chunks(n, self, 1)
+        return plot_chunks(chunks, 3*n*(n + 1), labels=labels, file_name=file_name, highlight=self,
+                           max_norm=n*n*self.norm())
+
+    def get_multiples(self, n):
+        # The multiples by every z with 1 <= hex distance(z) <= n (at least
+        # the first ring)
+        multiples = []
+        for k in range(1, max(n, 1) + 1):
+            multiples.extend(self.ring(k))
+        return multiples
 
-        return plt
+    def ring(self, k):
+        # Yields self * z for each z at hex distance exactly k, once each,
+        # counterclockwise from z = k. The ring is six sides of k points; side
+        # i runs from the corner k*UNITS[i] towards k*UNITS[i+1] in steps of
+        # UNITS[i+2].
+
+        if k == 0:
+            yield ZERO
+            return
+
+        for i in range(6):
+            step = self * UNITS[(i + 2) % 6]
+            multiple = self * UNITS[i] * k
+            for j in range(k):
+                yield multiple
+                multiple = multiple + step
+
+    def ball(self, n):
+        # Yields self * z for each z within hex distance n, ring by ring
+        for k in range(n + 1):
+            yield from self.ring(k)
+
+    @staticmethod
+    def plot_list(points, primes=False, labels=False, file_name=""):
+        from eisenstein_plot import plot_points
+
+        return plot_points(points, primes=primes, labels=labels, file_name=file_name)
 
     @staticmethod
     def plot_all(n=4, primes=False, labels=False, file_name=""):
-        ei = EisensteinInt.generate_eisenstein_ints(n)
-        EisensteinInt.plot_list(ei, primes, labels, file_name)
+        from eisenstein_array import EisensteinArray
+        from eisenstein_plot import plot_points
+
+        ei = EisensteinArray.hex_disk(n)
+        return plot_points(ei, primes=primes, labels=labels, file_name=file_name)
+
+    @staticmethod
+    def hex_disk(n, sextant=None):
+        # Yields every a + bω within hex distance n of 0 exactly once, row by
+        # row. The hex distance counts unit steps: max(|a|, |b|, |a-b|).
+        # With a sextant k only the points whose sextant() is UNITS[k] are
+        # yielded, sextant=0 gives the canonical points.
+
+        if sextant is None:
+            for b in range(-n, n + 1):
+                for a in range(max(-n, b - n), min(n, b + n) + 1):
+                    yield _new(a, b)
+        else:
+            u = UNITS[sextant]
+            for b in range(0, n):
+                for a in range(b + 1, n + 1):
+                    yield u * _new(a, b)
+
+    @staticmethod
+    def norm_disk(N, sextant=None):
+        # Yields every a + bω with Norm <= N exactly once, row by row.
+        # a^2 - ab + b^2 <= N  iff  |2a - b| <= sqrt(4N - 3b^2)
+        # With a sextant k only the points whose sextant() is UNITS[k] are
+        # yielded, sextant=0 gives the canonical points.
+
+        if N < 0:
+            return
+
+        if sextant is None:
+            b_max = isqrt(4 * N // 3)
+            for b in range(-b_max, b_max + 1):
+                root = isqrt(4*N - 3*b*b)
+                for a in range(-((root - b) // 2), (root + b) // 2 + 1):
+                    yield _new(a, b)
+        else:
+            u = UNITS[sextant]
+            b = 0
+            while b*b + b + 1 <= N:
+                root = isqrt(4*N - 3*b*b)
+                for a in range(b + 1, (root + b) // 2 + 1):
+                    yield u * _new(a, b)
+                b += 1
 
     @staticmethod
     def generate_eisenstein_ints(n):
@@ -574,3 +982,77 @@ class EisensteinInt:
                     eis.add(m)
                 eis.add(ei)
         return eis
+
+def _canonical_coefficients(a, b):
+    # Coefficients of the associate of a + bω in the first sextant
+    # (a > b >= 0), rotating by the inverse of its sextant unit as in
+    # signum(). Zero stays zero.
+    if (a > b and b >= 0):
+        return a, b # first
+    elif (b >= a and a > 0):
+        return b, b - a # second, times -ω
+    elif (b > 0 and 0 >= a):
+        return b - a, -a # third, times ω^2
+    elif (a < b and b <= 0):
+        return -a, -b # fourth, times -1
+    elif (b <= a and a < 0):
+        return -b, a - b # fifth, times ω
+    else:
+        return a - b, a # sixth, times 1+ω
+
+def _new(real, imaginary):
+    # Creates an EisensteinInt from int coefficients without the checks in
+    # __init__, for results of arithmetic on EisensteinInt
+    e = object.__new__(EisensteinInt)
+    _set_real(e, real)
+    _set_imaginary(e, imaginary)
+    return e
+
+# The slot setters, which bypass the immutable __setattr__
+_set_real = EisensteinInt.real.__set__
+_set_imaginary = EisensteinInt.imaginary.__set__
+
+ZERO = EisensteinInt(0, 0)
+ONE = EisensteinInt(1, 0)
+
+# 1-ω, the prime above 3
+LAMBDA = EisensteinInt(1, -1)
+
+# The 6 units, as successive powers of 1+ω
+UNITS = (EisensteinInt(1,0), EisensteinInt(1,1), EisensteinInt(0,1),
+         EisensteinInt(-1,0), EisensteinInt(-1,-1), EisensteinInt(0,-1))
+
+# The values of the cubic residue symbol: 1, ω, ω^2
+CUBE_ROOTS = (UNITS[0], UNITS[2], UNITS[4])
+
+# SMALL_PRIMES[n] is 1 when n < SMALL_PRIME_LIMIT is prime
+SMALL_PRIME_LIMIT = 1 << 16
+SMALL_PRIMES = bytearray([1]) * SMALL_PRIME_LIMIT
+SMALL_PRIMES[:2] = b"\x00\x00"
+for p in range(2, isqrt(SMALL_PRIME_LIMIT - 1) + 1):
+    if SMALL_PRIMES[p]:
+        SMALL_PRIMES[p*p::p] = bytes(len(range(p*p, SMALL_PRIME_LIMIT, p)))
+
+# Product of the trial divisors ahead of Miller-Rabin
+TRIAL_PRODUCT = 1
+for p in range(2, 200):
+    if SMALL_PRIMES[p]:
+        TRIAL_PRODUCT *= p
+
+# (bound, witnesses): Miller-Rabin with these witnesses is exact below bound
+# (sets from https://miller-rabin.appspot.com)
+MILLER_RABIN_WITNESSES = (
+    (341531, (9345883071009581737,)),
+    (1050535501, (336781006125, 9639812373923155)),
+    (350269456337, (4230279247111683200, 14694767155120705706, 16641139526367750375)),
+    (55245642489451, (2, 141889084524735, 1199124725622454117, 11096072698276303650)),
+    (7999252175582851, (2, 4130806001517, 149795463772692060, 186635894390467037, 3967304179347715805)),
+    (585226005592931977, (2, 123635709730000, 9233062284813009, 43835965440333360, 761179012939631437,
+                          1263739024124850375)),
+    (1 << 64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+)
+
+# Opt-in instrumentation, see eisenstein_stats.py
+if os.environ.get("EISENSTEIN_STATS"):
+    import eisenstein_stats
+    eisenstein_stats.enable_from_environment()
@@ -0,0 +1,220 @@
+import unittest
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray, batch_gcd, batch_cubic_residue, batch_count_of_norm, quantize
+
+class EisensteinArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.xs = [EisensteinInt(3,1), EisensteinInt(-2,5), EisensteinInt(0,0),
+                   EisensteinInt(1,-1), EisensteinInt(-7,-4), EisensteinInt(1,1)]
+        self.ys = [EisensteinInt(2,-1), EisensteinInt(4,4), EisensteinInt(-3,2),
+                   EisensteinInt(0,1), EisensteinInt(5,-9), EisensteinInt(-1,0)]
+
+    def test_list_round_trip(self):
+        a = EisensteinArray.from_list(self.xs)
+        self.assertEqual(a.real.dtype, np.int64)
+        self.assertEqual(a.to_list(), self.xs)
+        self.assertEqual(len(a), len(self.xs))
+        self.assertEqual(a[1], EisensteinInt(-2,5))
+        self.assertEqual(a[1:3].to_list(), self.xs[1:3])
+
+    def test_arithmetic(self):
+        a = EisensteinArray.from_list(self.xs)
+        b = EisensteinArray.from_list(self.ys)
+
+        self.assertEqual((a + b).to_list(), [x + y for x, y in zip(self.xs, self.ys)])
+        self.assertEqual((a - b).to_list(), [x - y for x, y in zip(self.xs, self.ys)])
+        self.assertEqual((a * b).to_list(), [x * y for x, y in zip(self.xs, self.ys)])
+
+        y = EisensteinInt(2,-3)
+        self.assertEqual((a * y).to_list(), [x * y for x in self.xs])
+        self.assertEqual((a + 2).to_list(), [x + 2 for x in self.xs])
+        self.assertEqual((2 * a).to_list(), [x * 2 for x in self.xs])
+
+    def test_conjugate_and_norm(self):
+        a = EisensteinArray.from_list(self.xs)
+        self.assertEqual(a.conjugate().to_list(), [x.conjugate() for x in self.xs])
+        self.assertEqual(a.norm().tolist(), [x.norm() for x in self.xs])
+
+    def test_predicates(self):
+        a = EisensteinArray.from_list(self.xs)
+        self.assertEqual(a.is_unit().tolist(), [x.is_unit() for x in self.xs])
+        self.assertEqual(a.is_even().tolist(), [x.is_even() for x in self.xs])
+
+    def test_floor_div(self):
+        a = EisensteinArray.from_list(self.xs)
+        b = EisensteinArray.from_list(self.ys)
+
+        self.assertEqual((a // b).to_list(), [x // y for x, y in zip(self.xs, self.ys)])
+
+        y = EisensteinInt(3,1)
+        self.assertEqual((a // y).to_list(), [x // y for x in self.xs])
+        self.assertEqual((a // 2).to_list(), [x // 2 for x in self.xs])
+
+    def test_divmod(self):
+        a = EisensteinArray.from_list(self.xs)
+        b = EisensteinArray.from_list(self.ys)
+
+        q, r = divmod(a, b)
+        expected = [divmod(x, y) for x, y in zip(self.xs, self.ys)]
+        self.assertEqual(q.to_list(), [e[0] for e in expected])
+        self.assertEqual(r.to_list(), [e[1] for e in expected])
+        self.assertEqual((a % b).to_list(), [e[1] for e in expected])
+
+        y = EisensteinInt(-4,-1)
+        q, r = divmod(a, y)
+        self.assertEqual(q.to_list(), [x // y for x in self.xs])
+        self.assertEqual(r.to_list(), [x % y for x in self.xs])
+
+    def test_divmod_random(self):
+        rng = np.random.default_rng(0)
+        a = EisensteinArray(rng.integers(-10**6, 10**6, 500), rng.integers(-10**6, 10**6, 500))
+        b = EisensteinArray(rng.integers(-10**3, 10**3, 500), rng.integers(1, 10**3, 500))
+
+        q, r = divmod(a, b)
+        xs = a.to_list()
+        ys = b.to_list()
+        self.assertEqual(q.to_list(), [x // y for x, y in zip(xs, ys)])
+        self.assertEqual((q * b + r).to_list(), xs)
+
+    def test_canonical(self):
+        xs = [x for x in self.xs if x != EisensteinInt(0,0)]
+        a = EisensteinArray.from_list(xs)
+        self.assertEqual(a.canonical().to_list(), [x.canonical() for x in xs])
+        self.assertEqual(EisensteinArray([0], [0]).canonical().to_list(), [EisensteinInt(0,0)])
+
+    def test_batch_gcd(self):
+        p = EisensteinInt(3,1)
+        q = EisensteinInt(1,-1)
+        r = EisensteinInt(2,-1)
+
+        xs = [p*q, EisensteinInt(12,0), EisensteinInt(5,0), EisensteinInt(0,0), EisensteinInt(7,3)]
+        ys = [p*r, EisensteinInt(6,0), EisensteinInt(7,0), EisensteinInt(-4,1), EisensteinInt(0,0)]
+
+        g = batch_gcd(EisensteinArray.from_list(xs), EisensteinArray.from_list(ys))
+        self.assertEqual(g.to_list(), [x.gcd(y).canonical() for x, y in zip(xs, ys)])
+
+        # int64 inputs whose remainder leaves int64
+        xs = [EisensteinInt(-8958250297359906189, -2863936093121621118), EisensteinInt(6, 3)]
+        ys = [EisensteinInt(-8914285147451856871, 9024434600338650866), EisensteinInt(4, 2)]
+        a = EisensteinArray.from_list(xs)
+        self.assertEqual(a.real.dtype, np.int64)
+        g = batch_gcd(a, EisensteinArray.from_list(ys))
+        self.assertEqual(g.to_list(), [x.gcd(y).canonical() for x, y in zip(xs, ys)])
+
+    def test_batch_gcd_random(self):
+        rng = np.random.default_rng(1)
+        c = EisensteinArray(rng.integers(-50, 50, 300), rng.integers(-50, 50, 300))
+        a = c * EisensteinArray(rng.integers(-10**4, 10**4, 300), rng.integers(-10**4, 10**4, 300))
+        b = c * EisensteinArray(rng.integers(-10**4, 10**4, 300), rng.integers(-10**4, 10**4, 300))
+
+        expected = []
+        for x, y in zip(a.to_list(), b.to_list()):
+            g = x.gcd(y)
+            expected.append(g.canonical() if g != EisensteinInt(0,0) else g)
+        self.assertEqual(batch_gcd(a, b).to_list(), expected)
+
+    def test_batch_cubic_residue(self):
+        rng = np.random.default_rng(3)
+        a = EisensteinArray(rng.integers(-10**4, 10**4, 300), rng.integers(-10**4, 10**4, 300))
+
+        for pi in [EisensteinInt(7,3), EisensteinInt(3,1) * EisensteinInt(2,0), EisensteinInt(2**70+1, 3)]:
+            expected = [x.cubic_residue(pi) for x in a.to_list()]
+            self.assertEqual(batch_cubic_residue(a, pi).to_list(), expected)
+
+        # A prime of norm near 2^63, where unreduced int64 products overflow
+        pi = EisensteinInt(1700000018, -1700000001)
+        self.assertTrue(pi.is_prime())
+        a = EisensteinArray(rng.integers(-10**12, 10**12, 200), rng.integers(-10**12, 10**12, 200))
+        self.assertEqual(batch_cubic_residue(a, pi).to_list(), [x.cubic_residue(pi) for x in a.to_list()])
+
+    def test_disks(self):
+        for n in [0, 1, 7]:
+            self.assertEqual(EisensteinArray.hex_disk(n).to_list(), list(EisensteinInt.hex_disk(n)))
+            self.assertEqual(EisensteinArray.hex_disk(n, 3).to_list(), list(EisensteinInt.hex_disk(n, 3)))
+
+        for N in [-5, -1, 0, 1, 2, 3, 49, 1000]:
+            self.assertEqual(EisensteinArray.norm_disk(N).to_list(), list(EisensteinInt.norm_disk(N)))
+            for k in range(6):
+                self.assertEqual(EisensteinArray.norm_disk(N, k).to_list(), list(EisensteinInt.norm_disk(N, k)))
+
+    def test_ring_and_ball(self):
+        a = EisensteinInt(3,-1)
+        for n in [0, 1, 5]:
+            self.assertEqual(EisensteinArray.ring(n, a).to_list(), list(a.ring(n)))
+            self.assertEqual(EisensteinArray.ball(n, a).to_list(), list(a.ball(n)))
+        self.assertEqual(EisensteinArray.ball(4).to_list(), list(EisensteinInt(1).ball(4)))
+
+        for n, first, size in [(0, 0, 5), (20, 1, 50), (20, 0, 1 << 20), (7, 3, 1)]:
+            chunks = [x for chunk in EisensteinArray.ball_chunks(n, a, first, size) for x in chunk.to_list()]
+            self.assertEqual(chunks, EisensteinArray.ball(n, a, first).to_list())
+
+    def test_of_norm(self):
+        for start, stop in [(0, 1), (-5, 0), (-5, -1), (-5, 1), (-3, 150), (40, 97), (10**12, 10**12 + 20)]:
+            expected = [x for n in range(start, stop) for x in EisensteinInt.of_norm(n)]
+            self.assertEqual(EisensteinArray.of_norm(start, stop).to_list(), expected)
+            self.assertEqual(batch_count_of_norm(start, stop).tolist(),
+                             [EisensteinInt.count_of_norm(n) for n in range(start, stop)])
+
+        a = EisensteinArray.from_list(self.xs)
+        self.assertEqual(a.associates().to_list(), [y for x in self.xs for y in x.associates()])
+
+    def test_complex_and_polar_form(self):
+        points = list(EisensteinInt.hex_disk(6))
+        a = EisensteinArray.from_list(points)
+        z = a.complex_form()
+        r, angle = a.polar_form()
+        for i, p in enumerate(points):
+            self.assertAlmostEqual(z[i], p.complex_form())
+            self.assertAlmostEqual(r[i], p.polar_form()[0])
+            self.assertAlmostEqual(angle[i], p.polar_form()[1])
+
+    def test_quantize(self):
+        rng = np.random.default_rng(6)
+        z = rng.uniform(-20, 20, 3000) + 1j * rng.uniform(-20, 20, 3000)
+        points, error = quantize(z)
+
+        lattice = EisensteinArray.hex_disk(40).complex_form()
+        nearest = np.abs(z[:, None] - lattice[None, :]).min(axis=1)
+        np.testing.assert_allclose(np.abs(error), nearest, atol=1e-9)
+        np.testing.assert_allclose(points.complex_form() + error, z, atol=1e-9)
+
+        self.assertEqual(points.to_list()[:100], [EisensteinInt.eisenstein_form(c) for c in z[:100].tolist()])
+
+        a = EisensteinArray.from_list(self.xs)
+        self.assertEqual(EisensteinArray.eisenstein_form(a.complex_form()).to_list(), self.xs)
+
+    def test_overflow(self):
+        big = 2**40
+        xs = [EisensteinInt(big, -big), EisensteinInt(3, big)]
+        a = EisensteinArray.from_list(xs)
+        self.assertEqual(a.real.dtype, np.int64)
+
+        self.assertEqual((a * a).to_list(), [x * x for x in xs])
+        self.assertEqual(a.norm().tolist(), [x.norm() for x in xs])
+
+        huge = [EisensteinInt(2**70, 1), EisensteinInt(-1, -2**65)]
+        a = EisensteinArray.from_list(huge)
+        self.assertEqual(a.real.dtype, object)
+        self.assertEqual(a.to_list(), huge)
+        self.assertEqual((a + 1).to_list(), [x + 1 for x in huge])
+
+        y = EisensteinInt(12345, -678)
+        q, r = divmod(a, y)
+        self.assertEqual(q.to_list(), [x // y for x in huge])
+        self.assertEqual(r.to_list(), [x % y for x in huge])
+
+        # Negating INT64_MIN widens instead of wrapping
+        low = -2**63
+        a = EisensteinArray([low, 1], [2, low])
+        self.assertEqual(a.real.dtype, np.int64)
+        self.assertEqual((-a).to_list(), [EisensteinInt(2**63, -2), EisensteinInt(-1, 2**63)])
+        self.assertEqual((5 - a).to_list(), [EisensteinInt(5 + 2**63, -2), EisensteinInt(4, 2**63)])
+
+        # Small values modulo a huge divisor, all quotients zero
+        small = EisensteinArray.from_list(self.xs)
+        y = EisensteinInt(2**70, 3)
+        self.assertEqual((small % y).to_list(), [x % y for x in self.xs])
+
+if (__name__ == '__main__'):
+    unittest.main()
@@ -0,0 +1,690 @@
+from math import isqrt, sqrt, pi
+import numpy as np
+from eisenstein import EisensteinInt, CUBE_ROOTS, UNITS, ONE
+
+INT64_MAX = int(np.iinfo(np.int64).max)
+
+# Rows a norm shell may span before shell() factors each norm instead
+SHELL_ROWS = 1 << 16
+
+# Samples quantize() rounds at a time
+QUANTIZE_CHUNK = 1 << 16
+
+class EisensteinArray:
+    """
+    Stores an array of Eisenstein integers a + bω as two coefficient arrays.
+
+    The coefficients are held in int64 NumPy arrays. When a value (or the
+    result of an operation) does not fit in int64 the arrays fall back to
+    object dtype so the arithmetic stays exact.
+
+    Create EisensteinArray by:
+         a = EisensteinArray([1, 2], [0, 3])  # Create [1, 2 + 3ω]
+         a = EisensteinArray.from_list([EisensteinInt(5,7), EisensteinInt(13)])
+
+    Functions implemented
+         Basic functions: init(), len(), [], iter(), str()
+         Arithmetic functions: +, divmod(), //, %, *, -
+
+         a.debug_str() - Returns a simple debug string to describe the
+            data members.
+
+         a.canonical() - Returns the associates in the first sextant.
+         a.associate_keys() - Returns an array of a.associate_key() for each
+            element.
+         a.conjugate() - Returns an EisensteinArray of the conjugates.
+         a.complex_form() - Returns a complex array.
+         a.polar_form() - Returns arrays of the radii and angles.
+         EisensteinArray.eisenstein_form(z) - Returns the nearest
+            EisensteinInt to each element of a complex array.
+         a.norm() - Returns an array of the norms.
+         a.bound() - Returns the largest absolute value of a coefficient.
+         a.is_even() - Returns a boolean array, whether each element is even.
+         a.is_unit() - Returns a boolean array, whether each element is a unit.
+         a.is_prime() - Returns a boolean array, whether each element is a
+            prime (see eisenstein_primes.is_prime_array).
+
+         a.to_list() - Returns a list of EisensteinInt.
+         EisensteinArray.from_list(points) - Returns the EisensteinArray
+            holding the given EisensteinInt.
+         EisensteinArray.hex_disk(n, sextant) - Returns every EisensteinInt
+            within hex distance n, optionally only those of one sextant.
+         EisensteinArray.ring(k, a) - Returns the multiples of a exactly k
+            hex steps away, in the order of a.ring(k).
+         EisensteinArray.ball(n, a) - Returns the multiples of a at most n
+            hex steps away, in the order of a.ball(n).
+         EisensteinArray.ball_chunks(n, a, first, size) - Yields the same
+            points in arrays of whole rings of about size points.
+         EisensteinArray.norm_disk(N, sextant) - Returns every EisensteinInt
+            with norm at most N, optionally only those of one sextant.
+         EisensteinArray.of_norm(start, stop) - Returns every EisensteinInt
+            with start <= norm < stop, in the order of EisensteinInt.of_norm.
+         a.associates() - Returns each element followed by its associates.
+
+         batch_gcd(a, b) - Compute the canonical greatest common divisor of
+            each pair in the EisensteinArrays a and b.
+         batch_cubic_residue(a, pi) - Compute the cubic residue symbol (x/pi)_3
+            of each element x of the EisensteinArray a.
+         quantize(z) - Returns the nearest EisensteinArray to a complex
+            array and the quantization error.
+         batch_count_of_norm(start, stop) - Returns an array of r(n), the
+            number of EisensteinInt of norm n, for n in range(start, stop).
+    """
+
+    def __init__(self, real=(), imaginary=None):
+        self.real = EisensteinArray.coefficients(real)
+
+        if imaginary is None:
+            self.imaginary = np.zeros(self.real.shape, dtype=self.real.dtype)
+        else:
+            self.imaginary = EisensteinArray.coefficients(imaginary)
+
+        assert self.real.shape == self.imaginary.shape
+
+        if self.real.dtype != self.imaginary.dtype:
+            self.real = self.real.astype(object)
+            self.imaginary = self.imaginary.astype(object)
+
+    @staticmethod
+    def coefficients(values):
+        # Returns values as an int64 array, or an object array of python ints
+        # when some value does not fit in int64
+        array = np.asarray(values)
+
+        if array.dtype.kind == "i":
+            return array.astype(np.int64, copy=False)
+
+        if array.size == 0:
+            return array.astype(np.int64)
+
+        assert array.dtype.kind in "uO"
+
+        array = np.array([int(x) for x in array.ravel()], dtype=object).reshape(array.shape)
+        if EisensteinArray.max_abs(array) <= INT64_MAX:
+            return array.astype(np.int64)
+        return array
+
+    @staticmethod
+    def max_abs(array):
+        # Largest absolute value in the array, as a python int
+        if array.size == 0:
+            return 0
+        return max(int(array.max()), -int(array.min()))
+
+    @staticmethod
+    def widen(bound, *arrays):
+        # Switch to object dtype when a result can reach beyond int64
+        if bound > INT64_MAX:
+            return [a.astype(object) for a in arrays]
+        return arrays
+
+    @staticmethod
+    def from_list(points):
+        points = list(points)
+        n = len(points)
+
+        try:
+            real = np.fromiter((p.real for p in points), dtype=np.int64, count=n)
+            imaginary = np.fromiter((p.imaginary for p in points), dtype=np.int64, count=n)
+        except OverflowError:
+            real = np.array([p.real for p in points], dtype=object)
+            imaginary = np.array([p.imaginary for p in points], dtype=object)
+
+        return EisensteinArray(real, imaginary)
+
+    @staticmethod
+    def rows(b, start, stop):
+        # Returns the points a + bω for start <= a <= stop of each row b
+        lengths = np.maximum(stop - start + 1, 0)
+        ends = np.cumsum(lengths)
+        offsets = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - lengths, lengths)
+
+        real = np.repeat(start, lengths) + offsets
+        imaginary = np.repeat(b, lengths)
+        return EisensteinArray(real, imaginary)
+
+    @staticmethod
+    def isqrt(d):
+        # isqrt of each element of a non-negative int64 array, from the float
+        # square root corrected by one
+        root = np.sqrt(d.astype(np.float64)).astype(np.int64)
+        root -= root*root > d
+        root += (root + 1)*(root + 1) <= d
+        return root
+
+    @staticmethod
+    def hex_disk(n, sextant=None):
+        # Same points and order as EisensteinInt.hex_disk(n, sextant)
+
+        if sextant is None:
+            b = np.arange(-n, n + 1, dtype=np.int64)
+            return EisensteinArray.rows(b, np.maximum(-n, b - n), np.minimum(n, b + n))
+
+        b = np.arange(0, n, dtype=np.int64)
+        return EisensteinArray.rows(b, b + 1, np.full_like(b, n)) * UNITS[sextant]
+
+    @staticmethod
+    def ring(k, a=ONE):
+        return EisensteinArray.ball(k, a, k)
+
+    @staticmethod
+    def ball(n, a=ONE, first=0):
+        # Rings first..n, written into one preallocated pair of coefficient
+        # arrays. Ring k is viewed as six sides of k points; point j of side i
+        # is k*corner[i] + j*step[i] with corner[i] = a*UNITS[i] and step[i] =
+        # a*UNITS[i+2], as in EisensteinInt.ring
+
+        if isinstance(a, int):
+            a = EisensteinInt(a)
+
+        lo = max(first, 1)
+        total = int(first == 0 and n >= 0)
+        if n >= lo:
+            total += 3*(n*(n + 1) - lo*(lo - 1))
+        corners = [a * u for u in UNITS]
+        steps = [corners[(i + 2) % 6] for i in range(6)]
+
+        bound = n * max(abs(c.real) + abs(c.imaginary) for c in corners)
+        dtype = object if bound > INT64_MAX else np.int64
+        real = np.zeros(total, dtype=dtype)
+        imaginary = np.zeros(total, dtype=dtype)
+
+        corner_real = np.array([[c.real] for c in corners], dtype=dtype)
+        corner_imag = np.array([[c.imaginary] for c in corners], dtype=dtype)
+        step_real = np.array([[s.real] for s in steps], dtype=dtype)
+        step_imag = np.array([[s.imaginary] for s in steps], dtype=dtype)
+        j = np.arange(max(n, 0), dtype=np.int64).astype(dtype)
+
+        offset = int(first == 0)
+        for k in range(lo, n + 1):
+            sides_real = real[offset:offset + 6*k].reshape(6, k)
+            sides_imag = imaginary[offset:offset + 6*k].reshape(6, k)
+            np.multiply(step_real, j[:k], out=sides_real)
+            np.multiply(step_imag, j[:k], out=sides_imag)
+            sides_real += k * corner_real
+            sides_imag += k * corner_imag
+            offset += 6*k
+
+        return EisensteinArray(real, imaginary)
+
+    @staticmethod
+    def ball_chunks(n, a=ONE, first=0, size=1 << 20):
+        # ball(n, a, first) as consecutive arrays of whole rings, each about
+        # size points or one ring
+        k = first
+        while k <= n:
+            last = k
+            total = 6*k or 1
+            while last < n and total + 6*(last + 1) <= size:
+                last += 1
+                total += 6*last
+            yield EisensteinArray.ball(last, a, k)
+            k = last + 1
+
+    @staticmethod
+    def norm_disk(N, sextant=None):
+        # Same points and order as EisensteinInt.norm_disk(N, sextant)
+
+        if N < 0:
+            return EisensteinArray()
+
+        if sextant is None:
+            b_max = isqrt(4 * N // 3)
+            b = np.arange(-b_max, b_max + 1, dtype=np.int64)
+        else:
+            b = np.arange(0, (isqrt(4*N - 3) + 1) // 2 if N > 0 else 0, dtype=np.int64)
+
+        root = EisensteinArray.isqrt(4*N - 3*b*b)
+
+        if sextant is None:
+            return EisensteinArray.rows(b, -((root - b) // 2), (root + b) // 2)
+
+        return EisensteinArray.rows(b, b + 1, (root + b) // 2) * UNITS[sextant]
+
+    @staticmethod
+    def shell(start, stop, sort=True):
+        # Real and imaginary coefficients of the canonical points (a > b >= 0)
+        # with start <= Norm < stop, sorted by norm and then coefficients
+        # unless sort is False.
+        # Row b holds the a with (a - b/2)^2 in [start - 3b^2/4, stop - 3b^2/4),
+        # but there are sqrt(stop) rows, so a short range of large norms is
+        # instead taken from EisensteinInt.of_norm.
+
+        start = max(start, 1)
+        if stop <= start:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        if isqrt(stop) > 4 * (stop - start) + SHELL_ROWS:
+            points = [x for n in range(start, stop) for x in EisensteinInt.of_norm(n)[::6]]
+            shell = EisensteinArray.from_list(points)
+            return shell.real, shell.imaginary
+
+        N = stop - 1
+        b = np.arange(0, (isqrt(4*N - 3) + 1) // 2, dtype=np.int64)
+        stop_a = (EisensteinArray.isqrt(4*N - 3*b*b) + b) // 2
+        start_a = (EisensteinArray.isqrt(np.maximum(4*(start - 1) - 3*b*b, 0)) + b) // 2 + 1
+        shell = EisensteinArray.rows(b, np.maximum(start_a, b + 1), stop_a)
+
+        real = shell.real
+        imag = shell.imaginary
+        if not sort:
+            return real, imag
+
+        order = np.lexsort((imag, real, real*real - real*imag + imag*imag))
+        return real[order], imag[order]
+
+    @staticmethod
+    def of_norm(start, stop):
+        # Same points and order as EisensteinInt.of_norm(n) for each n in
+        # range(start, stop), one after another
+
+        real, imag = EisensteinArray.shell(start, stop)
+        shell = EisensteinArray(real, imag).associates()
+
+        if start <= 0 < stop:
+            return EisensteinArray(np.concatenate(([0], shell.real)), np.concatenate(([0], shell.imaginary)))
+        return shell
+
+    def associates(self):
+        # Each element followed by its associates, in the order of units()
+        a = self.real
+        b = self.imaginary
+
+        rotations_real = []
+        rotations_imag = []
+        for i in range(6):
+            rotations_real.append(a)
+            rotations_imag.append(b)
+            # (a+bω)*(1+ω) = (a-b)+aω
+            a, b = EisensteinArray.widen(2 * EisensteinArray.max_abs(a) + 2 * EisensteinArray.max_abs(b), a, b)
+            a, b = a - b, a
+
+        return EisensteinArray(np.stack(rotations_real, axis=1).ravel(), np.stack(rotations_imag, axis=1).ravel())
+
+    def to_list(self):
+        return list(map(EisensteinInt, self.real.tolist(), self.imaginary.tolist()))
+
+    def __len__(self):
+        return len(self.real)
+
+    def __getitem__(self, index):
+        real = self.real[index]
+        imaginary = self.imaginary[index]
+
+        if isinstance(real, np.ndarray):
+            return EisensteinArray(real, imaginary)
+        return EisensteinInt(int(real), int(imaginary))
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __str__(self):
+        return "[{}]".format(", ".join(map(str, self.to_list())))
+
+    def debug_str(self):
+        result = "EisensteinArray({}, {})".format(self.real.tolist(), self.imaginary.tolist())
+        return result
+
+    def bound(self):
+        return max(EisensteinArray.max_abs(self.real), EisensteinArray.max_abs(self.imaginary))
+
+    @staticmethod
+    def operand(other):
+        # Returns the coefficients of other and the largest absolute value
+        if isinstance(other, EisensteinArray):
+            return other.real, other.imaginary, other.bound()
+
+        if isinstance(other, int):
+            other = EisensteinInt(other)
+
+        c = other.real
+        d = other.imaginary
+        return c, d, max(abs(c), abs(d))
+
+    def __add__(self, other):
+        c, d, m = EisensteinArray.operand(other)
+
+        a, b = EisensteinArray.widen(self.bound() + m, self.real, self.imaginary)
+
+        sum_real = a + c
+        sum_imaginary = b + d
+
+        return EisensteinArray(sum_real, sum_imaginary)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __divmod__(self, other):
+        q = self // other
+        r = self - (q*other)
+
+        # The nearest quotient leaves a remainder smaller than the divisor
+        assert np.all(r.norm() < EisensteinArray.divisor_norm(other))
+
+        return q,r
+
+    def __floordiv__(self, other):
+        # Rounds each coefficient of a * conjugate(b) / norm(b) to the
+        # nearest integer, the same rule as EisensteinInt.__floordiv__
+
+        if isinstance(other, int):
+            other = EisensteinInt(other)
+
+        denominator = EisensteinArray.divisor_norm(other)
+        assert np.all(denominator != 0)
+
+        numerator = self * other.conjugate()
+
+        nr = numerator.real
+        ni = numerator.imaginary
+
+        bound = 2 * numerator.bound() + 3 * EisensteinArray.max_abs(np.asarray(denominator))
+        if bound > INT64_MAX:
+            nr, ni = EisensteinArray.widen(bound, nr, ni)
+            if isinstance(denominator, np.ndarray):
+                denominator = denominator.astype(object)
+
+        qr = nr // denominator
+        qi = ni // denominator
+
+        qr = qr + ((2*qr+1)*denominator < 2*nr)
+        qi = qi + ((2*qi+1)*denominator < 2*ni)
+
+        return EisensteinArray(qr, qi)
+
+    def __mod__(self, other):
+        q, r = divmod(self, other)
+        return r
+
+    @staticmethod
+    def divisor_norm(other):
+        if isinstance(other, int):
+            other = EisensteinInt(other)
+        return other.norm()
+
+    def __mul__(self, other):
+        # (a+bω)*(c+dω)=(ac-bd)+(ad+b(c-d))ω
+
+        c, d, m = EisensteinArray.operand(other)
+
+        # A large scalar cannot multiply int64 arrays, even all zero ones
+        a, b = EisensteinArray.widen(max(3 * self.bound() * m, m), self.real, self.imaginary)
+        if isinstance(c, np.ndarray):
+            c, d = EisensteinArray.widen(2 * m, c, d)
+
+        product_real = (a*c)-(b*d)
+        product_imaginary = (a*d)+b*(c-d)
+
+        return EisensteinArray(product_real, product_imaginary)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __sub__(self, other):
+        c, d, m = EisensteinArray.operand(other)
+
+        a, b = EisensteinArray.widen(self.bound() + m, self.real, self.imaginary)
+
+        difference_real = a - c
+        difference_imaginary = b - d
+
+        return EisensteinArray(difference_real, difference_imaginary)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __neg__(self):
+        # -INT64_MIN does not fit in int64
+        a, b = EisensteinArray.widen(self.bound(), self.real, self.imaginary)
+        return EisensteinArray(-a, -b)
+
+    def canonical(self):
+        # Each element rotated into the first sextant (a > b and b >= 0), like
+        # EisensteinInt.canonical(). Zero stays zero.
+
+        a, b = EisensteinArray.widen(2 * self.bound(), self.real, self.imaginary)
+        return EisensteinArray(*EisensteinArray.canonical_coefficients(a, b))
+
+    @staticmethod
+    def canonical_coefficients(a, b):
+        # The canonical coefficients of coefficient arrays a and b, one case
+        # of _canonical_coefficients in eisenstein.py per sextant
+        sextants = [
+            (a > b) & (b >= 0),
+            (b >= a) & (a > 0),
+            (b > 0) & (0 >= a),
+            (a < b) & (b <= 0),
+            (b <= a) & (a < 0),
+        ]
+        real = np.select(sextants, [a, b, b - a, -a, -b], a - b)
+        imaginary = np.select(sextants, [b, b - a, -a, -b, a - b], a)
+        return real, imaginary
+
+    def associate_keys(self):
+        # EisensteinInt.associate_key() of each element
+        # The canonical coefficients reach 2m (b - a), so a*(a - 1) reaches
+        # 4m^2 + 2m before the halving
+        m = self.bound()
+        a, b = EisensteinArray.widen(4 * m * m + 4 * m, self.real, self.imaginary)
+        a, b = EisensteinArray.canonical_coefficients(a, b)
+        return np.where(a == 0, -1, a*(a - 1)//2 + b)
+
+    def complex_form(self):
+        # a + bω = (a - b/2) + (b*sqrt(3)/2)i, as in EisensteinInt.complex_form()
+        a = self.real.astype(np.float64)
+        b = self.imaginary.astype(np.float64)
+        return (a - b/2) + 1j * (b * (sqrt(3)/2))
+
+    def polar_form(self):
+        # Radius and angle arrays. The angles are in [-pi/2, 3pi/2) like
+        # EisensteinInt.polar_form().
+        z = self.complex_form()
+        angle = np.angle(z)
+        angle[angle < -pi/2] += 2*pi
+        return np.abs(z), angle
+
+    @staticmethod
+    def eisenstein_form(z):
+        # The nearest EisensteinInt to each element of a complex array, in
+        # chunks that stay in cache
+        return quantize(z)[0]
+
+    @staticmethod
+    def nearest(z):
+        # Coefficients of the nearest EisensteinInt to each element of z,
+        # with the corner test of EisensteinInt.eisenstein_form(). Ties go to
+        # the first candidate in the same order.
+
+        ie = z.imag * (2 / sqrt(3))
+        re = z.real + ie / 2
+
+        a = np.floor(re)
+        b = np.floor(ie)
+        fa = re - a
+        fb = ie - b
+
+        real = a.astype(np.int64)
+        imaginary = b.astype(np.int64)
+
+        # Squared distance to each corner, less that to the corner (0, 0)
+        best = np.zeros_like(fa)
+        d10 = 1 + fb - 2*fa
+        d01 = 1 + fa - 2*fb
+        d11 = 1 - fa - fb
+
+        corner10 = d10 < best
+        best = np.where(corner10, d10, best)
+        corner01 = d01 < best
+        best = np.where(corner01, d01, best)
+        corner11 = d11 < best
+
+        real += (corner10 & ~corner01) | corner11
+        imaginary += corner01 | corner11
+
+        return real, imaginary
+
+    def conjugate(self):
+        a, b = EisensteinArray.widen(2 * self.bound(), self.real, self.imaginary)
+
+        conjugate_real = a-b
+        conjugate_imag = -b
+        return EisensteinArray(conjugate_real, conjugate_imag)
+
+    def norm(self):
+        # Norm(a) = a^2 - ab + b^2
+
+        m = self.bound()
+        a, b = EisensteinArray.widen(3 * m * m, self.real, self.imaginary)
+        norm = a*a - a*b + b*b
+        return norm
+
+    def is_even(self):
+        # is_even iff. a+b is congruent to 0 mod 3
+
+        a, b = EisensteinArray.widen(2 * self.bound(), self.real, self.imaginary)
+        return (a + b) % 3 == 0
+
+    def is_unit(self):
+        return self.norm() == 1
+
+    def is_prime(self):
+        from eisenstein_primes import is_prime_array
+        return is_prime_array(self)
+
+def batch_gcd(a, b):
+    # Runs the Euclidean algorithm of EisensteinInt.gcd on every pair in
+    # lockstep. Pairs whose remainder reached zero drop out of the active set.
+
+    assert len(a) == len(b)
+
+    x_real, x_imag, y_real, y_imag = (np.array(c) for c in (a.real, a.imaginary, b.real, b.imaginary))
+    if object in (x_real.dtype, y_real.dtype):
+        x_real, x_imag, y_real, y_imag = (c.astype(object) for c in (x_real, x_imag, y_real, y_imag))
+
+    active = np.flatnonzero(b.norm() != 0)
+    while active.size > 0:
+        x = EisensteinArray(x_real[active], x_imag[active])
+        y = EisensteinArray(y_real[active], y_imag[active])
+
+        q, r = divmod(x, y)
+
+        # Remainders can leave int64 even when the inputs fit (divmod widens
+        # them), so the buffers follow
+        if r.real.dtype == object and x_real.dtype != object:
+            x_real, x_imag, y_real, y_imag = (c.astype(object) for c in (x_real, x_imag, y_real, y_imag))
+
+        x_real[active] = y.real
+        x_imag[active] = y.imaginary
+        y_real[active] = r.real
+        y_imag[active] = r.imaginary
+
+        active = active[r.norm() != 0]
+
+    return EisensteinArray(x_real, x_imag).canonical()
+
+def batch_cubic_residue(a, pi):
+    # Runs the descent of EisensteinInt.cubic_residue on every element in
+    # lockstep. Returns an EisensteinArray of 1, ω, ω^2 or 0.
+
+    n = len(a)
+    b = pi.primary()[1]
+
+    dtype = np.int64
+    if a.real.dtype == object or b.bit_length() > 60:
+        dtype = object
+
+    x_real = a.real.astype(dtype)
+    x_imag = a.imaginary.astype(dtype)
+    y_real = np.full(n, b.real, dtype=dtype)
+    y_imag = np.full(n, b.imaginary, dtype=dtype)
+
+    j = np.zeros(n, dtype=np.int64)
+    zero = np.zeros(n, dtype=bool)
+
+    active = np.arange(n) if b.norm() > 1 else np.arange(0)
+    while active.size > 0:
+        y = EisensteinArray(y_real[active], y_imag[active])
+        x = EisensteinArray(x_real[active], x_imag[active]) % y
+
+        # (a/b) = 0 when b divides a
+        divides = x.norm() == 0
+        zero[active[divides]] = True
+        keep = ~divides
+        active, x, y = active[keep], x[keep], y[keep]
+
+        # Divide out 1-ω: (a+bω)/(1-ω) = ((2a-b)+(a+b)ω)/3
+        xr, xi = x.real, x.imaginary
+        k = np.zeros(len(active), dtype=np.int64)
+        even = (xr + xi) % 3 == 0
+        while even.any():
+            xr, xi = np.where(even, (2*xr - xi) // 3, xr), np.where(even, (xr + xi) // 3, xi)
+            k += even
+            even = (xr + xi) % 3 == 0
+
+        # The primary associate, x = UNITS[t] * primary
+        t = np.zeros(len(active), dtype=np.int64)
+        pr, pi_ = xr, xi
+        rr, ri = xr, xi
+        for i in range(6):
+            found = (rr % 3 == 2) & (ri % 3 == 0)
+            pr = np.where(found, rr, pr)
+            pi_ = np.where(found, ri, pi_)
+            t = np.where(found, i, t)
+            # Multiply by (1+ω)^-1 = -ω: (a+bω)*(0-ω) = b+(b-a)ω
+            rr, ri = ri, ri - rr
+
+        # Each factor reduced mod 3 first, their products overflow int64 for
+        # norms near 2^63
+        m = np.asarray((y.real + 1) // 3 % 3, dtype=np.int64)
+        e = np.asarray((y.norm() - 1) // 3 % 3, dtype=np.int64)
+        j[active] = (j[active] + 2*(t % 3)*e + 2*m*(k % 3)) % 3
+
+        x_real[active], x_imag[active] = y.real, y.imaginary
+        y_real[active], y_imag[active] = pr, pi_
+
+        active = active[np.asarray(EisensteinArray(pr, pi_).norm() > 1, dtype=bool)]
+
+    real = np.array([r.real for r in CUBE_ROOTS])[j]
+    imaginary = np.array([r.imaginary for r in CUBE_ROOTS])[j]
+    real[zero] = 0
+    imaginary[zero] = 0
+
+    return EisensteinArray(real, imaginary)
+
+def batch_count_of_norm(start, stop):
+    # r(n) for each n in range(start, stop), counted from the canonical points
+    # of the shell: every nonzero norm has its points in 6 sextants
+
+    if stop <= start:
+        return np.zeros(0, dtype=np.int64)
+
+    real, imag = EisensteinArray.shell(start, stop)
+    norms = real*real - real*imag + imag*imag
+    counts = 6 * np.bincount(np.asarray(norms - max(start, 1), dtype=np.int64), minlength=max(stop - max(start, 1), 0))
+
+    # Norms below 1 in the range: r(0) = 1, negative norms have none
+    low = np.zeros(max(min(stop, 1) - start, 0), dtype=np.int64)
+    if start <= 0 < stop:
+        low[-1] = 1
+
+    return np.concatenate((low, counts))
+
+def quantize(z):
+    # Rounds each sample of a complex array to the nearest point of the
+    # hexagonal lattice. Returns the points and the error z - point.
+    # Runs QUANTIZE_CHUNK samples at a time, which keeps the temporaries in
+    # cache and more than doubles the throughput on large arrays.
+
+    z = np.asarray(z, dtype=np.complex128).ravel()
+    real = np.empty(len(z), dtype=np.int64)
+    imaginary = np.empty(len(z), dtype=np.int64)
+    error = np.empty(len(z), dtype=np.complex128)
+
+    for i in range(0, len(z), QUANTIZE_CHUNK):
+        chunk = z[i:i + QUANTIZE_CHUNK]
+        a, b = EisensteinArray.nearest(chunk)
+        real[i:i + QUANTIZE_CHUNK] = a
+        imaginary[i:i + QUANTIZE_CHUNK] = b
+        error[i:i + QUANTIZE_CHUNK] = chunk - ((a - b/2) + 1j * (b * (sqrt(3)/2)))
+
+    return EisensteinArray(real, imaginary), error
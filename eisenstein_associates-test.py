@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+from eisenstein_associates import AssociateSet, AssociateDict
+
+class AssociatesTest(unittest.TestCase):
+    def test_keys(self):
+        points = list(EisensteinInt.hex_disk(15))
+        for x in points:
+            self.assertEqual(EisensteinInt.from_associate_key(x.associate_key()), x.canonical())
+            self.assertEqual(set(y.associate_key() for y in x.associates()), {x.associate_key()})
+
+        # One key per associate class
+        self.assertEqual(len(set(x.associate_key() for x in points)), len(set(x.canonical() for x in points)))
+
+        a = EisensteinArray.from_list(points + [EisensteinInt(2**62, -2**62)])
+        self.assertEqual(a.associate_keys().tolist(), [x.associate_key() for x in a.to_list()])
+
+        # Coefficients that fit in int64 whose keys do not
+        near = [EisensteinInt(-1600000000, 1600000000), EisensteinInt(1600000000, -1600000000),
+                EisensteinInt(-3000000000, 100)]
+        a = EisensteinArray.from_list(near)
+        self.assertEqual(a.real.dtype, np.int64)
+        self.assertEqual(a.associate_keys().tolist(), [x.associate_key() for x in near])
+
+    def test_set(self):
+        s = AssociateSet([EisensteinInt(3,1), EisensteinInt(-3,-1), EisensteinInt(1,3)])
+        self.assertEqual(len(s), 2)
+        self.assertIn(EisensteinInt(1,-2), s)
+        self.assertNotIn(EisensteinInt(1,-3), s)
+        self.assertNotIn(3, s)
+        self.assertEqual(set(s), {EisensteinInt(3,1), EisensteinInt(3,2)})
+
+        s.discard(EisensteinInt(3,1) * EisensteinInt(0,1))
+        s.discard(3)
+        self.assertEqual(set(s), {EisensteinInt(3,2)})
+
+        s.update(EisensteinArray.hex_disk(2))
+        self.assertEqual(set(s), set(x.canonical() for x in EisensteinInt.hex_disk(2)) | {EisensteinInt(3,2)})
+
+        x = EisensteinInt(-1600000000, 1600000000)
+        s = AssociateSet()
+        s.update(EisensteinArray.from_list([x]))
+        self.assertIn(x, s)
+        self.assertEqual(list(s), [x.canonical()])
+
+    def test_dict(self):
+        d = AssociateDict()
+        d[EisensteinInt(2,1)] = 5
+        self.assertEqual(d[EisensteinInt(1,-1)], 5)
+        d[EisensteinInt(-2,-1)] += 1
+        self.assertEqual(d[EisensteinInt(2,1)], 6)
+        self.assertEqual(len(d), 1)
+
+        unit, factors = EisensteinInt(12,3).factor()
+        d = AssociateDict(factors)
+        for prime, e in factors.items():
+            self.assertEqual(d[prime * EisensteinInt(0,1)], e)
+        self.assertEqual(list(d), list(factors))
+
+        del d[EisensteinInt(1,-1)]
+        self.assertNotIn(EisensteinInt(2,1), d)
+        self.assertRaises(KeyError, d.__getitem__, EisensteinInt(2,1))
+
+        # Keys that are not EisensteinInt are missing, as with in
+        self.assertIsNone(d.get(5))
+        self.assertEqual(d.pop("x", 0), 0)
+        self.assertRaises(KeyError, d.__getitem__, 5)
+        self.assertRaises(KeyError, d.__delitem__, 5)
+        self.assertRaises(KeyError, d.__setitem__, 5, 1)
+
+if (__name__ == '__main__'):
+    unittest.main()
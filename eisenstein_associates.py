@@ -0,0 +1,88 @@
+"""
+Containers keyed by associate class: a, -a, ωa, ... are the same key.
+
+Entries are stored under EisensteinInt.associate_key(), one int computed
+from the coefficients, so a lookup neither builds the six associates nor
+the canonical EisensteinInt.
+
+Create the containers by:
+     s = AssociateSet([EisensteinInt(3,1), EisensteinInt(-3,-1)])  # 1 element
+     d = AssociateDict()
+     d[EisensteinInt(2,1)] = 5  # d[EisensteinInt(1,-1)] is 5 too
+
+Both follow the collections.abc interfaces (MutableSet, MutableMapping).
+Iterating yields the canonical representatives.
+
+Functions implemented
+     s.add(x), s.discard(x), x in s, len(s), iter(s)
+     s.update(points) - Adds an iterable of EisensteinInt or an
+        EisensteinArray, whose keys are computed in one vectorized pass.
+     d[x], d[x] = v, del d[x], x in d, len(d), iter(d)
+"""
+
+from collections.abc import MutableSet, MutableMapping
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+
+class AssociateSet(MutableSet):
+    def __init__(self, points=()):
+        self.members = set()
+        self.update(points)
+
+    def __contains__(self, x):
+        return isinstance(x, EisensteinInt) and x.associate_key() in self.members
+
+    def __iter__(self):
+        return map(EisensteinInt.from_associate_key, self.members)
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, x):
+        self.members.add(x.associate_key())
+
+    def discard(self, x):
+        if isinstance(x, EisensteinInt):
+            self.members.discard(x.associate_key())
+
+    def update(self, points):
+        if isinstance(points, EisensteinArray):
+            self.members.update(points.associate_keys().tolist())
+        else:
+            self.members.update(x.associate_key() for x in points)
+
+    def __str__(self):
+        return "{{{}}}".format(", ".join(map(str, self)))
+
+class AssociateDict(MutableMapping):
+    def __init__(self, items=()):
+        self.entries = {}
+        self.update(items)
+
+    @staticmethod
+    def key(x):
+        # Only an EisensteinInt can be a key, as in __contains__
+        if not isinstance(x, EisensteinInt):
+            raise KeyError(x)
+        return x.associate_key()
+
+    def __getitem__(self, x):
+        return self.entries[AssociateDict.key(x)]
+
+    def __setitem__(self, x, value):
+        self.entries[AssociateDict.key(x)] = value
+
+    def __delitem__(self, x):
+        del self.entries[AssociateDict.key(x)]
+
+    def __contains__(self, x):
+        return isinstance(x, EisensteinInt) and x.associate_key() in self.entries
+
+    def __iter__(self):
+        return map(EisensteinInt.from_associate_key, self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        return "{{{}}}".format(", ".join("{}: {}".format(x, v) for x, v in self.items()))
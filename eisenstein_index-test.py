@@ -0,0 +1,62 @@
+import random
+import unittest
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+from eisenstein_index import EisensteinIndex
+
+class EisensteinIndexTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(7)
+        self.points = {EisensteinInt(random.randint(-300, 300), random.randint(-300, 300)) for i in range(3000)}
+
+    def by_distance(self, z, points):
+        return sorted(points, key=lambda p: ((p - z).norm(), p.real, p.imaginary))
+
+    def test_cells(self):
+        index = EisensteinIndex(cell=10)
+        # Each point goes to the nearest center of 10*Z[ω]
+        for p in EisensteinInt.hex_disk(25):
+            a, b = index.cell_of(p)
+            center = EisensteinInt(a, b) * 10
+            nearest = min((p - EisensteinInt(10*x.real, 10*x.imaginary)).norm() for x in EisensteinInt(a, b).ball(1))
+            self.assertEqual((p - center).norm(), nearest)
+
+    def test_add_and_discard(self):
+        index = EisensteinIndex(self.points, cell=8)
+        self.assertEqual(len(index), len(self.points))
+        self.assertEqual(set(index), self.points)
+
+        p = next(iter(self.points))
+        index.add(p)
+        self.assertEqual(len(index), len(self.points))
+        index.discard(p)
+        index.discard(p)
+        self.assertNotIn(p, index)
+        self.assertEqual(len(index), len(self.points) - 1)
+
+        index.update(EisensteinArray.from_list([p]))
+        self.assertIn(p, index)
+
+    def test_within(self):
+        for cell in [1, 5, 32]:
+            index = EisensteinIndex(self.points, cell=cell)
+            for z in [EisensteinInt(0,0), EisensteinInt(290,-300), EisensteinInt(1000,1000)]:
+                for n in [0, 50, 2000]:
+                    expected = self.by_distance(z, [p for p in self.points if (p - z).norm() <= n])
+                    self.assertEqual(index.within(z, n), expected)
+
+    def test_nearest(self):
+        for cell in [1, 6, 40]:
+            index = EisensteinIndex(self.points, cell=cell)
+            for z in [EisensteinInt(3,-7), EisensteinInt(-300,300), EisensteinInt(5000,0)]:
+                ordered = self.by_distance(z, self.points)
+                for k in [1, 10]:
+                    self.assertEqual(index.nearest(z, k), ordered[:k])
+
+        small = EisensteinIndex([EisensteinInt(1,0), EisensteinInt(0,4)])
+        self.assertEqual(small.nearest(EisensteinInt(0,0), 5), [EisensteinInt(1,0), EisensteinInt(0,4)])
+        self.assertEqual(EisensteinIndex().nearest(EisensteinInt(0,0), 3), [])
+        self.assertEqual(small.nearest(EisensteinInt(0,0), 0), [])
+
+if (__name__ == '__main__'):
+    unittest.main()
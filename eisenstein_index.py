@@ -0,0 +1,154 @@
+"""
+Spatial index of Eisenstein integers for radius and nearest-neighbour
+queries.
+
+Points are bucketed by hexagonal cells: the Voronoi cells of the coarse
+lattice s*Z[ω] for a cell size s. A cell is keyed by the coefficients of its
+center divided by s. A query visits the cells ring by ring around the cell of
+its center, with the rings of EisensteinInt.ring(), and stops at the first
+ring that cannot hold a closer point. A cell has circumradius s/sqrt(3) and
+the centers of ring k are at least k*s*sqrt(3)/2 away, so every point of ring
+k is at least s*(k*sqrt(3)/2 - 2/sqrt(3)) from the query. The work grows with
+the area searched, not with the number of stored points.
+
+Distances are norms: p is within n of z when Norm(p - z) <= n.
+
+Create the index by:
+     index = EisensteinIndex(points, cell=16)
+
+Functions implemented
+     index.add(p), index.discard(p), p in index, len(index), iter(index)
+     index.update(points) - Adds an iterable of EisensteinInt or an
+        EisensteinArray.
+     index.cell_of(p) - Returns the key of the cell holding p.
+     index.within(z, n) - Returns the points p with Norm(p - z) <= n, sorted
+        by distance and then coefficients.
+     index.nearest(z, k) - Returns the k points nearest to z, sorted the same
+        way.
+"""
+
+import heapq
+from math import sqrt
+from eisenstein import ONE
+
+class EisensteinIndex:
+    def __init__(self, points=(), cell=16):
+        assert(cell > 0)
+
+        self.cell = cell
+        self.cells = {}
+        self.size = 0
+        self.update(points)
+
+    def cell_of(self, p):
+        # The nearest point of s*Z[ω] is one of the 4 corners of the cell
+        # floor(a/s) <= a' <= floor(a/s)+1, floor(b/s) <= b' <= floor(b/s)+1,
+        # as in EisensteinInt.eisenstein_form()
+        s = self.cell
+        a = p.real // s
+        b = p.imaginary // s
+
+        best = None
+        for da, db in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            x = p.real - (a + da)*s
+            y = p.imaginary - (b + db)*s
+            d = x*x - x*y + y*y
+            if best is None or d < best[0]:
+                best = (d, a + da, b + db)
+
+        return best[1], best[2]
+
+    def add(self, p):
+        bucket = self.cells.setdefault(self.cell_of(p), set())
+        if p not in bucket:
+            bucket.add(p)
+            self.size += 1
+
+    def discard(self, p):
+        key = self.cell_of(p)
+        bucket = self.cells.get(key)
+        if bucket is not None and p in bucket:
+            bucket.remove(p)
+            self.size -= 1
+            if not bucket:
+                del self.cells[key]
+
+    def update(self, points):
+        for p in points:
+            self.add(p)
+
+    def __contains__(self, p):
+        return p in self.cells.get(self.cell_of(p), ())
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for bucket in self.cells.values():
+            yield from bucket
+
+    def bound(self, k):
+        # Lower bound on the distance from a query to the points of ring k,
+        # shaved so float rounding never overstates it
+        return self.cell * (k*sqrt(3)/2 - 2/sqrt(3)) * (1 - 1e-9)
+
+    def rings(self, z):
+        # Yields, for k = 0, 1, ..., bound(k) and the points stored in ring k
+        # around the cell of z. Once a ring has more cells than are occupied,
+        # the remaining occupied cells are grouped by ring instead, so a query
+        # far from the points does not walk all the empty rings between.
+        a, b = self.cell_of(z)
+        seen = 0
+        k = 0
+        while seen < self.size:
+            if 6*k > len(self.cells):
+                rest = {}
+                for (x, y), bucket in self.cells.items():
+                    # Hex distance of the cell from the cell of z
+                    d = max(abs(x - a), abs(y - b), abs(x - a - y + b))
+                    if d >= k:
+                        rest.setdefault(d, []).extend(bucket)
+                for d in sorted(rest):
+                    yield self.bound(d), rest[d]
+                return
+
+            points = []
+            for offset in ONE.ring(k):
+                bucket = self.cells.get((a + offset.real, b + offset.imaginary))
+                if bucket:
+                    points.extend(bucket)
+            seen += len(points)
+            yield self.bound(k), points
+            k += 1
+
+    def within(self, z, n):
+        found = []
+        for bound, points in self.rings(z):
+            if bound > 0 and bound*bound > n:
+                break
+            for p in points:
+                d = (p - z).norm()
+                if d <= n:
+                    found.append((d, p.real, p.imaginary, p))
+
+        found.sort(key=lambda entry: entry[:3])
+        return [entry[3] for entry in found]
+
+    def nearest(self, z, k=1):
+        if k <= 0:
+            return []
+
+        # A max-heap of the k best (negated) candidates so far
+        best = []
+        for bound, points in self.rings(z):
+            if len(best) == k and bound > 0 and bound*bound > -best[0][0]:
+                break
+            for p in points:
+                entry = (-(p - z).norm(), -p.real, -p.imaginary, p)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry[:3] > best[0][:3]:
+                    heapq.heapreplace(best, entry)
+
+        best.sort(key=lambda entry: entry[:3], reverse=True)
+        return [entry[3] for entry in best]
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+from eisenstein_io import EisensteinWriter, save, load, write_text, read_text
+
+class EisensteinIOTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "points.eis")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        points = EisensteinArray.hex_disk(20)
+        save(self.file_name, points)
+        self.assertEqual(os.path.getsize(self.file_name), 32 + 16 * len(points))
+
+        loaded = load(self.file_name)
+        self.assertIsInstance(loaded.real.base, np.memmap)
+        self.assertEqual(loaded.real.dtype, np.int64)
+        self.assertEqual(loaded.to_list(), points.to_list())
+        self.assertEqual(load(self.file_name, mmap=False).to_list(), points.to_list())
+
+        save(self.file_name, [])
+        self.assertEqual(len(load(self.file_name)), 0)
+
+    def test_big_values(self):
+        points = [EisensteinInt(3,1), EisensteinInt(2**70, -5), EisensteinInt(-2**63, 0),
+                  EisensteinInt(7, -3**90), EisensteinInt(-1,-1)]
+        save(self.file_name, points)
+
+        loaded = load(self.file_name)
+        self.assertEqual(loaded.real.dtype, object)
+        self.assertEqual(loaded.to_list(), points)
+
+    def test_streaming(self):
+        chunks = [EisensteinArray.hex_disk(3), [EisensteinInt(2**64, 1)], EisensteinArray.norm_disk(50)]
+        with EisensteinWriter(self.file_name) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+        expected = [x for chunk in chunks for x in chunk]
+        self.assertEqual(writer.count, len(expected))
+        self.assertEqual(load(self.file_name).to_list(), expected)
+
+    def test_from_string(self):
+        for x in list(EisensteinInt.hex_disk(3)) + [EisensteinInt(10**30, -10**25), EisensteinInt(0, -1)]:
+            self.assertEqual(EisensteinInt.from_string(str(x)), x)
+
+        self.assertEqual(EisensteinInt.from_string("3+2w"), EisensteinInt(3,2))
+        self.assertEqual(EisensteinInt.from_string(" -ω "), EisensteinInt(0,-1))
+        for text in ["", "3 7ω", "3 +", "ωω", "1.5"]:
+            self.assertRaises(ValueError, EisensteinInt.from_string, text)
+
+    def test_text(self):
+        points = EisensteinArray.norm_disk(30)
+        text_file = os.path.join(self.directory.name, "points.txt")
+        write_text(text_file, points)
+        self.assertEqual(read_text(text_file).to_list(), points.to_list())
+
+if (__name__ == '__main__'):
+    unittest.main()
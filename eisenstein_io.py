@@ -0,0 +1,173 @@
+"""
+Binary and text storage for large lists of Eisenstein integers.
+
+The binary format is little-endian:
+     header   32 bytes  b"EISN", version (uint32), count (uint64),
+                        number of big values (uint64), reserved (uint64)
+     body     16 bytes per element, the real and imaginary coefficients
+              as int64 pairs
+     big      one record per element that does not fit in int64: its index,
+              real and imaginary coefficients as zigzag LEB128 varints
+
+An element in the big section has INT64_MIN for both coefficients in the
+body. Without big values load() maps the body with numpy.memmap and the
+EisensteinArray coefficients are views into it, nothing is copied.
+
+The text format is one element per line, as str(EisensteinInt) writes it.
+
+Functions implemented
+     save(file_name, points) - Writes an EisensteinArray or an iterable of
+        EisensteinInt.
+     load(file_name, mmap) - Returns the EisensteinArray stored in the file,
+        memory mapped unless mmap is False.
+     EisensteinWriter(file_name) - Writes a file in chunks, for datasets that
+        do not fit in memory. Use as a context manager or close() it.
+     write_text(file_name, points) - Writes one element per line.
+     read_text(file_name) - Returns the EisensteinArray of a text file.
+"""
+
+import struct
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray, INT64_MAX
+
+MAGIC = b"EISN"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQQ")
+
+# Body value of an element stored in the big section
+BIG = -INT64_MAX - 1
+
+def zigzag(n):
+    return 2*n if n >= 0 else -2*n - 1
+
+def unzigzag(z):
+    return z >> 1 if z % 2 == 0 else -(z >> 1) - 1
+
+def write_varint(out, n):
+    # LEB128: 7 bits per byte, low bits first, high bit set on all but the last
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def read_varint(data, i):
+    # Returns the varint starting at data[i] and the index after it
+    n = 0
+    shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        n |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            return n, i
+
+class EisensteinWriter:
+    """
+    Streams Eisenstein integers to a binary file
+
+    Create the writer by:
+         with EisensteinWriter("primes.eis") as writer:
+             writer.write(chunk)  # an EisensteinArray or EisensteinInts
+
+    The body is written as it comes. Big values are kept until close(),
+    which appends them and fills in the header.
+    """
+
+    def __init__(self, file_name):
+        self.file = open(file_name, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+        self.count = 0
+        self.big = bytearray()
+        self.big_count = 0
+
+    def write(self, points):
+        if not isinstance(points, EisensteinArray):
+            points = EisensteinArray.from_list(points)
+
+        real = points.real
+        imag = points.imaginary
+
+        if real.dtype == object:
+            big = np.array([not (-INT64_MAX <= r <= INT64_MAX and -INT64_MAX <= i <= INT64_MAX)
+                            for r, i in zip(real.tolist(), imag.tolist())], dtype=bool)
+        else:
+            big = (real == BIG) | (imag == BIG)
+
+        for index in np.flatnonzero(big).tolist():
+            write_varint(self.big, self.count + index)
+            write_varint(self.big, zigzag(int(real[index])))
+            write_varint(self.big, zigzag(int(imag[index])))
+            self.big_count += 1
+
+        body = np.empty((len(points), 2), dtype="<i8")
+        body[:, 0] = np.where(big, BIG, real)
+        body[:, 1] = np.where(big, BIG, imag)
+        body.tofile(self.file)
+
+        self.count += len(points)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.write(self.big)
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.count, self.big_count, 0))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+def save(file_name, points):
+    with EisensteinWriter(file_name) as writer:
+        writer.write(points)
+
+def load(file_name, mmap=True):
+    with open(file_name, "rb") as f:
+        magic, version, count, big_count, reserved = HEADER.unpack(f.read(HEADER.size))
+
+    assert magic == MAGIC, "{} is not an Eisenstein integer file".format(file_name)
+    assert version == VERSION, "unsupported version {}".format(version)
+
+    if count == 0:
+        return EisensteinArray()
+
+    if mmap:
+        body = np.memmap(file_name, dtype="<i8", mode="r", offset=HEADER.size, shape=(count, 2))
+    else:
+        body = np.fromfile(file_name, dtype="<i8", count=2*count, offset=HEADER.size).reshape(count, 2)
+
+    real = body[:, 0]
+    imag = body[:, 1]
+
+    if big_count > 0:
+        # Python ints for the big values, this copies the body
+        with open(file_name, "rb") as f:
+            f.seek(HEADER.size + 16*count)
+            data = f.read()
+
+        real = real.astype(object)
+        imag = imag.astype(object)
+        i = 0
+        for k in range(big_count):
+            index, i = read_varint(data, i)
+            r, i = read_varint(data, i)
+            m, i = read_varint(data, i)
+            real[index] = unzigzag(r)
+            imag[index] = unzigzag(m)
+
+    return EisensteinArray(real, imag)
+
+def write_text(file_name, points):
+    with open(file_name, "w", encoding="utf-8") as f:
+        for x in points:
+            f.write(str(x))
+            f.write("\n")
+
+def read_text(file_name):
+    with open(file_name, encoding="utf-8") as f:
+        return EisensteinArray.from_list(EisensteinInt.from_string(line) for line in f if line.strip())
@@ -0,0 +1,128 @@
+import random
+import unittest
+from eisenstein import EisensteinInt
+from eisenstein_matrix import EisensteinMatrix
+
+def random_matrix(n, m, bound, rng):
+    return EisensteinMatrix([[EisensteinInt(rng.randint(-bound, bound), rng.randint(-bound, bound)) for j in range(m)]
+                             for i in range(n)])
+
+def naive_product(A, B):
+    a = A.to_list()
+    b = B.to_list()
+    return EisensteinMatrix([[sum((a[i][k] * b[k][j] for k in range(len(b))), EisensteinInt(0)) for j in range(len(b[0]))]
+                             for i in range(len(a))])
+
+def naive_determinant(a):
+    # Laplace expansion along the first row
+    if not a:
+        return EisensteinInt(1)
+    result = EisensteinInt(0)
+    for j in range(len(a)):
+        term = a[0][j] * naive_determinant([row[:j] + row[j+1:] for row in a[1:]])
+        result = result + term if j % 2 == 0 else result - term
+    return result
+
+def random_unimodular(n, rng):
+    U = EisensteinMatrix.identity(n)
+    for k in range(3*n):
+        i, j = rng.sample(range(n), 2)
+        rows = EisensteinMatrix.identity(n).to_list()
+        rows[i][j] = EisensteinInt(rng.randint(-3, 3), rng.randint(-3, 3))
+        U = EisensteinMatrix(rows) @ U
+    rows = U.to_list()
+    rows[0] = [x * EisensteinInt(1,1) for x in rows[0]]
+    return EisensteinMatrix(rows)
+
+class MatrixTest(unittest.TestCase):
+    def test_basic(self):
+        A = EisensteinMatrix([[EisensteinInt(3,1), 2], [0, EisensteinInt(0,1)]])
+        self.assertEqual(A.shape, (2, 2))
+        self.assertEqual(A[0, 0], EisensteinInt(3,1))
+        self.assertEqual(str(A), "[[3 + ω, 2],\n [0, ω]]")
+        self.assertEqual(A.transpose()[0, 1], EisensteinInt(0))
+        self.assertEqual(A - A, EisensteinMatrix([[0, 0], [0, 0]]))
+        self.assertEqual(A + A, 2 * A)
+        self.assertEqual((A * EisensteinInt(0,1))[1, 1], EisensteinInt(-1,-1))
+
+        low = EisensteinMatrix([[EisensteinInt(-2**63, 1)]])
+        self.assertEqual((-low)[0, 0], EisensteinInt(2**63, -1))
+
+    def test_product(self):
+        rng = random.Random(25)
+        for n, k, m, bound in [(1, 1, 1, 5), (3, 4, 2, 10), (6, 6, 6, 1000), (4, 5, 3, 2**40), (3, 3, 3, 2**70)]:
+            A = random_matrix(n, k, bound, rng)
+            B = random_matrix(k, m, bound, rng)
+            self.assertEqual(A @ B, naive_product(A, B))
+
+        A = random_matrix(4, 4, 10, rng)
+        self.assertEqual(EisensteinMatrix.identity(4) @ A, A)
+
+    def test_determinant(self):
+        rng = random.Random(3)
+        for n in range(1, 6):
+            A = random_matrix(n, n, 5, rng)
+            self.assertEqual(A.determinant(), naive_determinant(A.to_list()))
+
+        self.assertEqual(EisensteinMatrix([[0, 1], [1, 0]]).determinant(), EisensteinInt(-1))
+        self.assertEqual(EisensteinMatrix([[1, 2], [2, 4]]).determinant(), EisensteinInt(0))
+        self.assertEqual(EisensteinMatrix([[0, 1, 2], [0, 3, 4], [0, 5, 6]]).determinant(), EisensteinInt(0))
+
+    def test_hermite(self):
+        rng = random.Random(7)
+        for n, m in [(3, 3), (4, 3), (3, 5), (5, 5), (6, 6)]:
+            A = random_matrix(n, m, 20, rng)
+            H, U = A.hermite(transform=True)
+            self.assertEqual(U @ A, H)
+            self.assertEqual(U.determinant().norm(), 1)
+            self.assertEqual(A.hermite(), H)
+
+            # Echelon form with canonical pivots and reduced entries above
+            r = 0
+            for j in range(m):
+                if r < n and H[r, j] != EisensteinInt(0):
+                    self.assertEqual(H[r, j], H[r, j].canonical())
+                    for i in range(r):
+                        self.assertLess(H[i, j].norm(), H[r, j].norm())
+                    for i in range(r + 1, n):
+                        self.assertEqual(H[i, j], EisensteinInt(0))
+                    r += 1
+
+            # The same lattice gives the same form
+            self.assertEqual((random_unimodular(n, rng) @ A).hermite(), H)
+
+        A = EisensteinMatrix([[2, 4, 6], [1, 2, 3], [EisensteinInt(0,1), EisensteinInt(0,2), EisensteinInt(0,3)]])
+        self.assertEqual(A.hermite(), EisensteinMatrix([[1, 2, 3], [0, 0, 0], [0, 0, 0]]))
+
+    def test_hermite_modular(self):
+        rng = random.Random(11)
+        for n in [1, 2, 4, 8, 12]:
+            A = random_matrix(n, n, 9, rng) * EisensteinInt(2,1)
+            D = A.determinant()
+            self.assertEqual(A.hermite_modular(D), A.hermite(transform=True)[0])
+
+        # Entries stay below the determinant
+        A = random_matrix(20, 20, 100, rng)
+        D = A.determinant()
+        self.assertTrue(all(x.norm() <= D.norm() for row in A.hermite().to_list() for x in row))
+
+    def test_smith(self):
+        rng = random.Random(13)
+        for n in [2, 3, 4]:
+            A = random_matrix(n, n, 10, rng)
+            S = A.smith()
+            self.assertEqual((random_unimodular(n, rng) @ A @ random_unimodular(n, rng)).smith(), S)
+
+            d = EisensteinInt(1)
+            for i in range(n):
+                d = d * S[i, i]
+                self.assertEqual(S[i, i], S[i, i].canonical())
+                if i > 0:
+                    self.assertEqual(S[i, i] % S[i-1, i-1], EisensteinInt(0))
+            self.assertEqual(d.canonical(), A.determinant().canonical())
+
+        self.assertEqual(EisensteinMatrix([[6, 0], [0, 4]]).smith(), EisensteinMatrix([[2, 0], [0, 12]]))
+        self.assertEqual(EisensteinMatrix([[2, 4, 6], [1, 2, 4]]).smith(), EisensteinMatrix([[1, 0, 0], [0, 2, 0]]))
+
+if (__name__ == '__main__'):
+    unittest.main()
@@ -0,0 +1,362 @@
+import numpy as np
+from eisenstein import EisensteinInt, ZERO, ONE
+from eisenstein_array import EisensteinArray
+
+def product(a, b, c, d):
+    # (a+bω)*(c+dω)=(ac-bd)+(ad+b(c-d))ω, on numbers or whole arrays
+    return a*c - b*d, a*d + b*(c - d)
+
+class Rows:
+    # Row operations on the coefficient arrays of matrices, applied to each
+    # (real, imaginary) pair alike: the matrix being reduced and the
+    # matrices recording the transform. Rows are combined whole.
+
+    def __init__(self, *pairs):
+        self.pairs = pairs
+
+    def entry(self, i, j):
+        real, imag = self.pairs[0]
+        return EisensteinInt(int(real[i, j]), int(imag[i, j]))
+
+    def combine(self, r, i, s, t, u, v):
+        # Rows (r, i) become (s*r + t*i, u*r + v*i)
+        for x, y in self.pairs:
+            row_r = (x[r].copy(), y[r].copy())
+            row_i = (x[i].copy(), y[i].copy())
+            sr = product(*row_r, s.real, s.imaginary)
+            ti = product(*row_i, t.real, t.imaginary)
+            ur = product(*row_r, u.real, u.imaginary)
+            vi = product(*row_i, v.real, v.imaginary)
+            x[r], y[r] = sr[0] + ti[0], sr[1] + ti[1]
+            x[i], y[i] = ur[0] + vi[0], ur[1] + vi[1]
+
+    def subtract(self, i, r, q):
+        # Row i -= q * row r
+        for x, y in self.pairs:
+            qr = product(x[r], y[r], q.real, q.imaginary)
+            x[i] -= qr[0]
+            y[i] -= qr[1]
+
+    def scale(self, r, u):
+        for x, y in self.pairs:
+            x[r], y[r] = product(x[r].copy(), y[r].copy(), u.real, u.imaginary)
+
+    def reduce(self, r, modulus):
+        # Each entry of row r by its remainder modulo modulus
+        for x, y in self.pairs:
+            remainder = EisensteinArray(x[r], y[r]) % modulus
+            x[r] = remainder.real.astype(object)
+            y[r] = remainder.imaginary.astype(object)
+
+    def eliminate(self, r, j, below, modulus=None):
+        # Clears column j of the rows below into row r
+        for i in below:
+            b = self.entry(i, j)
+            if b == ZERO:
+                continue
+            a = self.entry(r, j)
+            if a == ZERO:
+                self.combine(r, i, ZERO, ONE, ONE, ZERO)
+                continue
+
+            q, remainder = divmod(b, a)
+            if remainder == ZERO:
+                self.subtract(i, r, q)
+            else:
+                # [[s, t], [-b/g, a/g]] has determinant (s*a + t*b)/g = 1
+                g, s, t = a.xgcd(b)
+                self.combine(r, i, s, t, -(b // g), a // g)
+
+            if modulus is not None:
+                self.reduce(r, modulus)
+                self.reduce(i, modulus)
+
+    def reduce_above(self, r, j):
+        # The entries above the pivot (r, j) by their remainder modulo it
+        pivot = self.entry(r, j)
+        for i in range(r):
+            q = self.entry(i, j) // pivot
+            if q != ZERO:
+                self.subtract(i, r, q)
+
+class EisensteinMatrix:
+    """
+    Matrices over Z[ω]
+
+    The entries a + bω are held as two 2-D coefficient arrays, int64 or
+    object arrays of python ints when a value does not fit, as in
+    EisensteinArray. Products, determinants and the normal forms work on
+    whole rows and blocks of these arrays.
+
+    Create the matrix by:
+         A = EisensteinMatrix([[EisensteinInt(3,1), 2], [0, EisensteinInt(0,1)]])
+         A = EisensteinMatrix.from_arrays(real, imaginary)
+
+    Functions implemented
+         Basic functions: init(), ==, str(), [i, j]
+         Arithmetic functions: +, -, unary -, * (by a number), @
+
+         A.shape - The number of rows and columns.
+         A.to_list() - Returns the rows as lists of EisensteinInt.
+         A.transpose() - Returns the transposed matrix.
+         EisensteinMatrix.identity(n) - Returns the n x n identity.
+         A.determinant() - Returns the determinant by fraction-free (Bareiss)
+            elimination, every division exact.
+         A.hermite(transform) - Returns the Hermite normal form H, and a
+            unimodular U with U @ A = H when transform is True.
+         A.hermite_modular(D) - Returns the Hermite normal form of a square
+            matrix whose determinant divides D, computed modulo D.
+         A.smith() - Returns the Smith normal form.
+
+    The Hermite normal form is in row echelon form. Each pivot is canonical
+    (first sextant) and the entries above it are reduced by the division
+    algorithm, the remainder of the nearest quotient, so they have a smaller
+    norm than the pivot. That remainder depends only on the residue class,
+    which makes H unique. Rows are combined by the 2 x 2 unimodular matrix
+    of the extended Euclidean algorithm, putting the gcd on the pivot in one
+    step. A square matrix of nonzero determinant is reduced modulo the
+    determinant throughout, which bounds every entry; otherwise the rows
+    above are reduced as soon as a pivot is final.
+
+    The Smith normal form is diagonal with canonical entries d1 | d2 | ...,
+    reached by taking the Hermite normal form of rows and of columns in turn.
+    """
+
+    def __init__(self, rows=()):
+        rows = [[EisensteinInt(x) if isinstance(x, int) else x for x in row] for row in rows]
+        n = len(rows[0]) if rows else 0
+        assert all(len(row) == n for row in rows)
+
+        points = EisensteinArray.from_list(x for row in rows for x in row)
+        self.real = points.real.reshape(len(rows), n)
+        self.imaginary = points.imaginary.reshape(len(rows), n)
+
+    @staticmethod
+    def from_arrays(real, imaginary=None):
+        points = EisensteinArray(real, imaginary)
+        assert points.real.ndim == 2
+
+        A = EisensteinMatrix()
+        A.real = points.real
+        A.imaginary = points.imaginary
+        return A
+
+    @staticmethod
+    def identity(n):
+        return EisensteinMatrix.from_arrays(np.eye(n, dtype=np.int64))
+
+    @property
+    def shape(self):
+        return self.real.shape
+
+    def bound(self):
+        return max(EisensteinArray.max_abs(self.real), EisensteinArray.max_abs(self.imaginary))
+
+    def __getitem__(self, index):
+        i, j = index
+        return EisensteinInt(int(self.real[i, j]), int(self.imaginary[i, j]))
+
+    def to_list(self):
+        return [[self[i, j] for j in range(self.shape[1])] for i in range(self.shape[0])]
+
+    def __eq__(self, other):
+        if not isinstance(other, EisensteinMatrix):
+            return False
+        return (self.shape == other.shape and np.array_equal(self.real, other.real)
+                and np.array_equal(self.imaginary, other.imaginary))
+
+    def __str__(self):
+        return "[{}]".format(",\n ".join("[{}]".format(", ".join(map(str, row))) for row in self.to_list()))
+
+    def transpose(self):
+        return EisensteinMatrix.from_arrays(self.real.T.copy(), self.imaginary.T.copy())
+
+    def __add__(self, other):
+        assert self.shape == other.shape
+        a, b, c, d = EisensteinArray.widen(self.bound() + other.bound(), self.real, self.imaginary, other.real, other.imaginary)
+        return EisensteinMatrix.from_arrays(a + c, b + d)
+
+    def __neg__(self):
+        # -INT64_MIN does not fit in int64
+        a, b = EisensteinArray.widen(self.bound(), self.real, self.imaginary)
+        return EisensteinMatrix.from_arrays(-a, -b)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __mul__(self, other):
+        # Multiplies every entry by a number
+        if isinstance(other, int):
+            other = EisensteinInt(other)
+        if not isinstance(other, EisensteinInt):
+            return NotImplemented
+
+        c = other.real
+        d = other.imaginary
+        a, b = EisensteinArray.widen(3 * self.bound() * max(abs(c), abs(d)), self.real, self.imaginary)
+        return EisensteinMatrix.from_arrays(*product(a, b, c, d))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __matmul__(self, other):
+        # The product formula on whole matrices, with A@C, B@D and A@D + B@C
+        # taken as (A+B)@(C+D) - A@C - B@D: three integer matrix products
+        if not isinstance(other, EisensteinMatrix):
+            return NotImplemented
+
+        assert self.shape[1] == other.shape[0]
+
+        a, b = self.real, self.imaginary
+        c, d = other.real, other.imaginary
+
+        # Every entry of (A+B)@(C+D) sums shape[1] products of up to
+        # 2*bound times 2*bound, and the result subtracts 3 more such sums
+        bound = 7 * self.shape[1] * self.bound() * other.bound()
+        a, b, c, d = EisensteinArray.widen(bound, a, b, c, d)
+
+        ac = a @ c
+        bd = b @ d
+        mixed = (a + b) @ (c + d)
+
+        return EisensteinMatrix.from_arrays(ac - bd, mixed - ac - 2*bd)
+
+    def objects(self):
+        # Copies of the coefficients as object arrays, for elimination whose
+        # intermediate values have no useful bound
+        return self.real.astype(object), self.imaginary.astype(object)
+
+    def determinant(self):
+        # Bareiss: after step k, entry (i, j) is the determinant of the
+        # leading k x k block bordered by row i and column j, so dividing by
+        # the previous pivot is exact. Each step updates the whole trailing
+        # block at once.
+
+        n, m = self.shape
+        assert n == m
+
+        real, imag = self.objects()
+        sign = 1
+        previous = ONE
+
+        for k in range(n - 1):
+            if real[k, k] == 0 and imag[k, k] == 0:
+                nonzero = np.flatnonzero((real[k+1:, k] != 0) | (imag[k+1:, k] != 0))
+                if len(nonzero) == 0:
+                    return EisensteinInt(0)
+                i = k + 1 + nonzero[0]
+                real[[k, i]] = real[[i, k]]
+                imag[[k, i]] = imag[[i, k]]
+                sign = -sign
+
+            pr, pi = real[k, k], imag[k, k]
+            block_real, block_imag = product(real[k+1:, k+1:], imag[k+1:, k+1:], pr, pi)
+            outer_real, outer_imag = product(real[k+1:, k, None], imag[k+1:, k, None], real[k, k+1:], imag[k, k+1:])
+
+            # Exact division by the previous pivot: x/p = x*conj(p)/Norm(p)
+            conjugate = previous.conjugate()
+            norm = previous.norm()
+            numerator_real, numerator_imag = product(block_real - outer_real, block_imag - outer_imag,
+                                                     conjugate.real, conjugate.imaginary)
+            real[k+1:, k+1:] = numerator_real // norm
+            imag[k+1:, k+1:] = numerator_imag // norm
+
+            previous = EisensteinInt(pr, pi)
+
+        if n == 0:
+            return ONE
+        return sign * EisensteinInt(int(real[n-1, n-1]), int(imag[n-1, n-1]))
+
+    def hermite(self, transform=False):
+        n, m = self.shape
+
+        # A square matrix of nonzero determinant D spans a lattice holding
+        # D*e_j for every j, which lets hermite_modular() work modulo D
+        if not transform and n == m and n > 0:
+            D = self.determinant()
+            if D != ZERO:
+                return self.hermite_modular(D)
+
+        real, imag = self.objects()
+        ureal, uimag = EisensteinMatrix.identity(n).objects()
+        rows = Rows((real, imag), (ureal, uimag))
+
+        r = 0
+        for j in range(m):
+            if r == n:
+                break
+
+            rows.eliminate(r, j, range(r + 1, n))
+
+            pivot = rows.entry(r, j)
+            if pivot == ZERO:
+                continue
+
+            rows.scale(r, pivot.canonical() // pivot)
+            rows.reduce_above(r, j)
+            r += 1
+
+        H = EisensteinMatrix.from_arrays(real, imag)
+        if transform:
+            return H, EisensteinMatrix.from_arrays(ureal, uimag)
+        return H
+
+    def hermite_modular(self, D):
+        # Hermite normal form modulo D, a multiple of the determinant (Cohen,
+        # A Course in Computational Algebraic Number Theory, 2.4.8). Adding
+        # R*e_j to a row stays in the lattice, so every row is kept reduced
+        # modulo R and no entry grows beyond Norm(D). Once column j is
+        # eliminated, its pivot is g = gcd(a, R) and the rows below still
+        # span (R/g)*e_k for the later columns, so R becomes R/g.
+
+        n = self.shape[0]
+        real, imag = self.objects()
+        rows = Rows((real, imag))
+
+        R = D
+        for j in range(n):
+            rows.eliminate(j, j, range(j + 1, n), R)
+
+            g, s, t = rows.entry(j, j).xgcd(R)
+            unit = g.canonical() // g
+            rows.scale(j, s * unit)
+            rows.reduce(j, R)
+            real[j, j], imag[j, j] = (g * unit).real, (g * unit).imaginary
+            R = R // g
+
+        for j in range(n):
+            rows.reduce_above(j, j)
+
+        return EisensteinMatrix.from_arrays(real, imag)
+
+    def is_diagonal(self):
+        off = ~np.eye(*self.shape, dtype=bool)
+        return not (np.any(self.real[off] != 0) or np.any(self.imaginary[off] != 0))
+
+    def smith(self):
+        # The Hermite normal form of the rows, then of the columns, until
+        # only the diagonal is left. Each pass that changes the matrix leaves
+        # a pivot of smaller norm in the top left, so this terminates.
+        D = self
+        while not D.is_diagonal():
+            D = D.hermite().transpose().hermite().transpose()
+
+        # diag(x, y) is equivalent to diag(gcd(x, y), lcm(x, y))
+        n = min(self.shape)
+        diagonal = [D[i, i] for i in range(n)]
+        for i in range(n):
+            for j in range(i + 1, n):
+                x, y = diagonal[i], diagonal[j]
+                if x == ZERO:
+                    diagonal[i], diagonal[j] = y, x
+                elif y % x != ZERO:
+                    g = x.gcd(y)
+                    diagonal[i], diagonal[j] = g, x * y // g
+            diagonal[i] = diagonal[i].canonical()
+
+        real = np.zeros(self.shape, dtype=object)
+        imag = np.zeros(self.shape, dtype=object)
+        for i, x in enumerate(diagonal):
+            real[i, i] = x.real
+            imag[i, i] = x.imaginary
+        return EisensteinMatrix.from_arrays(real, imag)
@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+from eisenstein_mod import EisensteinMod, EisensteinCRT, crt
+
+class EisensteinModTest(unittest.TestCase):
+    def setUp(self):
+        self.moduli = [EisensteinInt(3,1), EisensteinInt(2,0), EisensteinInt(1,-1),
+                       EisensteinInt(6,-3), EisensteinInt(-5,8), EisensteinInt(12,0)]
+
+    def test_residues(self):
+        for m in self.moduli:
+            R = EisensteinMod(m)
+            residues = R.residues()
+            self.assertEqual(len(residues), m.norm())
+            # Pairwise incongruent
+            for x in residues:
+                self.assertEqual(R.reduce(x), x)
+            self.assertEqual(len(set(residues)), len(set(r % m for r in residues)))
+
+    def test_reduce(self):
+        for m in self.moduli:
+            R = EisensteinMod(m)
+            for x in [EisensteinInt(17,-40), EisensteinInt(-3,-3), EisensteinInt(0,0), EisensteinInt(123456,789)]:
+                r = R.reduce(x)
+                self.assertEqual((x - r) % m, EisensteinInt(0,0))
+                self.assertEqual(R.reduce(x + m * EisensteinInt(5,-2)), r)
+
+    def test_mul_and_pow(self):
+        m = EisensteinInt(-5,8)
+        R = EisensteinMod(m)
+        x = EisensteinInt(4,7)
+
+        self.assertEqual(R.mul(x, x), R.reduce(x * x))
+
+        p = EisensteinInt(1)
+        for e in range(40):
+            self.assertEqual(R.pow(x, e), R.reduce(p))
+            p = p * x
+
+        e = 2**300 + 12345
+        self.assertEqual(R.pow(x, e), R.reduce(pow(x, e, m)))
+
+    def test_inverse(self):
+        m = EisensteinInt(-5,8)
+        R = EisensteinMod(m)
+        one = R.reduce(1)
+        for x in R.residues():
+            if x.gcd(m).is_unit():
+                self.assertEqual(R.mul(x, R.inverse(x)), one)
+                self.assertEqual(R.pow(x, -3), R.inverse(R.pow(x, 3)))
+
+    def test_pow_fermat(self):
+        # x^(Norm(π)-1) = 1 modulo a prime π
+        R = EisensteinMod(EisensteinInt(7,3))
+        self.assertTrue(EisensteinInt(7,3).is_prime())
+        for x in R.residues()[1:]:
+            self.assertEqual(R.pow(x, R.n - 1), R.reduce(1))
+
+    def test_arrays(self):
+        m = EisensteinInt(-5,8)
+        R = EisensteinMod(m)
+        rng = np.random.default_rng(2)
+        x = EisensteinArray(rng.integers(-10**6, 10**6, 200), rng.integers(-10**6, 10**6, 200))
+        y = EisensteinArray(rng.integers(-10**6, 10**6, 200), rng.integers(-10**6, 10**6, 200))
+
+        xs = x.to_list()
+        ys = y.to_list()
+        self.assertEqual(R.reduce_array(x).to_list(), [R.reduce(a) for a in xs])
+        self.assertEqual(R.mul_array(x, y).to_list(), [R.mul(a, b) for a, b in zip(xs, ys)])
+        self.assertEqual(R.pow_array(x, 1001).to_list(), [R.pow(a, 1001) for a in xs])
+
+    def test_crt(self):
+        moduli = [EisensteinInt(3,1), EisensteinInt(2,0), EisensteinInt(1,-1),
+                  EisensteinInt(-5,7), EisensteinInt(7,3)]
+        C = EisensteinCRT(moduli)
+        self.assertEqual(C.modulus.norm(), 7 * 4 * 3 * 109 * 37)
+
+        for x in [EisensteinInt(0,0), EisensteinInt(17,-40), EisensteinInt(-1234,567)]:
+            residues = [x % m for m in moduli]
+            self.assertEqual(C.solve(residues), C.ring.reduce(x))
+            self.assertEqual(crt(residues, moduli), C.ring.reduce(x))
+
+        # One modulus and an odd number of them up the tree
+        self.assertEqual(crt([EisensteinInt(5,2)], [EisensteinInt(3,1)]), EisensteinMod(EisensteinInt(3,1)).reduce(EisensteinInt(5,2)))
+        self.assertEqual(crt([1, 2, 3], [EisensteinInt(2,0), 5, EisensteinInt(3,1)]) % 5, EisensteinInt(2,0))
+
+        self.assertRaises(AssertionError, EisensteinCRT, [EisensteinInt(3,1), EisensteinInt(6,2)])
+
+    def test_crt_array(self):
+        moduli = [EisensteinInt(3,1), EisensteinInt(2,0), EisensteinInt(-5,8)]
+        C = EisensteinCRT(moduli)
+
+        rng = np.random.default_rng(4)
+        x = EisensteinArray(rng.integers(-10**5, 10**5, 50), rng.integers(-10**5, 10**5, 50))
+        residues = [EisensteinArray.from_list([z % m for z in x.to_list()]) for m in moduli]
+        self.assertEqual(C.solve_array(residues).to_list(), C.ring.reduce_array(x).to_list())
+
+if (__name__ == '__main__'):
+    unittest.main()
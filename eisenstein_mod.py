@@ -0,0 +1,255 @@
+import numpy as np
+from eisenstein import EisensteinInt, ONE
+from eisenstein_array import EisensteinArray
+
+class EisensteinMod:
+    """
+    Arithmetic in the quotient ring Z[ω]/(m)
+
+    Create the ring by:
+         R = EisensteinMod(EisensteinInt(3,1))  # Z[ω]/(3 + ω), 7 elements
+
+    The ideal (m) is a lattice in Z^2 with basis m = (a, b) and
+    mω = (-b, a-b). Its Hermite normal form has basis (A, 0), (B, C) with
+    A*C = Norm(m), so every a + bω has exactly one residue x + yω with
+    0 <= x < A and 0 <= y < C. Reducing takes two integer divisions instead
+    of an Eisenstein division.
+
+    Functions implemented
+         R.reduce(x) - Returns the canonical residue of x.
+         R.residues() - Returns a list of all Norm(m) residues.
+         R.add(x, y), R.sub(x, y), R.mul(x, y) - Returns the reduced result.
+         R.pow(x, e) - Returns x^e with sliding window exponentiation. A
+            negative e raises the inverse.
+         R.inverse(x) - Returns the inverse of x through the extended
+            Euclidean algorithm. x must be coprime to m.
+
+         R.reduce_array(x) - Returns the canonical residues of an
+            EisensteinArray.
+         R.mul_array(x, y) - Returns the reduced products of EisensteinArrays
+            (y can also be a single EisensteinInt).
+         R.pow_array(x, e) - Returns x^e for each element of an
+            EisensteinArray.
+    """
+
+    def __init__(self, m):
+        if isinstance(m, int):
+            m = EisensteinInt(m)
+
+        a = m.real
+        b = m.imaginary
+        n = m.norm()
+
+        assert(n != 0)
+
+        # C = gcd of the ω coefficients of the lattice, reached by u*m + v*mω
+        C, u, v = EisensteinMod.int_xgcd(b, a - b)
+        A = n // C
+        B = (u*a - v*b) % A
+
+        self.m = m
+        self.n = n
+        self.hnf = (A, B, C)
+
+    @staticmethod
+    def int_xgcd(x, y):
+        # Returns (g, u, v) with u*x + v*y = g = gcd(x, y) >= 0
+        u0, v0, u1, v1 = 1, 0, 0, 1
+        while y != 0:
+            q, r = divmod(x, y)
+            x, y = y, r
+            u0, v0, u1, v1 = u1, v1, u0 - q*u1, v0 - q*v1
+        if x < 0:
+            return -x, -u0, -v0
+        return x, u0, v0
+
+    def __str__(self):
+        return "Z[ω]/({})".format(self.m)
+
+    def reduce(self, x):
+        if isinstance(x, int):
+            x = EisensteinInt(x)
+
+        A, B, C = self.hnf
+
+        k = x.imaginary // C
+        real = (x.real - k*B) % A
+        imaginary = x.imaginary - k*C
+
+        return EisensteinInt(real, imaginary)
+
+    def residues(self):
+        A, B, C = self.hnf
+        return [EisensteinInt(x, y) for y in range(C) for x in range(A)]
+
+    def add(self, x, y):
+        return self.reduce(x + y)
+
+    def sub(self, x, y):
+        return self.reduce(x - y)
+
+    def mul(self, x, y):
+        return self.reduce(x * y)
+
+    def pow(self, x, e):
+        if e < 0:
+            x = self.inverse(x)
+            e = -e
+
+        x = self.reduce(x)
+        result = self.reduce(1)
+        if e == 0:
+            return result
+
+        # Odd powers x, x^3, ..., x^(2^k - 1) for windows of k bits
+        k = EisensteinMod.window(e)
+        x2 = self.mul(x, x)
+        table = [x]
+        for i in range(1, 1 << (k - 1)):
+            table.append(self.mul(table[-1], x2))
+
+        bits = bin(e)[2:]
+        i = 0
+        while i < len(bits):
+            if bits[i] == "0":
+                result = self.mul(result, result)
+                i += 1
+            else:
+                # Longest window of at most k bits ending in a 1
+                j = min(i + k, len(bits))
+                while bits[j - 1] == "0":
+                    j -= 1
+                for s in range(j - i):
+                    result = self.mul(result, result)
+                result = self.mul(result, table[int(bits[i:j], 2) // 2])
+                i = j
+
+        return result
+
+    @staticmethod
+    def window(e):
+        # Window width for an exponent of e
+        n = e.bit_length()
+        if n <= 8:
+            return 1
+        elif n <= 64:
+            return 3
+        elif n <= 512:
+            return 4
+        else:
+            return 5
+
+    def inverse(self, x):
+        # g = s*x + t*m, and g is a unit when x is coprime to m, so
+        # x^-1 = s * g^-1 = s * conjugate(g)
+
+        if isinstance(x, int):
+            x = EisensteinInt(x)
+
+        g, s, t = self.reduce(x).xgcd(self.m)
+
+        assert g.is_unit(), "{} is not invertible modulo {}".format(x, self.m)
+
+        return self.reduce(s * g.conjugate())
+
+    def reduce_array(self, x):
+        A, B, C = self.hnf
+
+        a, b = EisensteinArray.widen(x.bound() + B * (x.bound() // C + 1), x.real, x.imaginary)
+
+        k = b // C
+        real = (a - k*B) % A
+        imaginary = b - k*C
+
+        return EisensteinArray(real, imaginary)
+
+    def mul_array(self, x, y):
+        return self.reduce_array(x * y)
+
+    def pow_array(self, x, e):
+        # Square and multiply, one vectorized step per bit of e
+
+        if e < 0:
+            x = EisensteinArray.from_list([self.inverse(z) for z in x.to_list()])
+            e = -e
+
+        x = self.reduce_array(x)
+        result = self.reduce_array(EisensteinArray(np.ones(len(x), dtype=np.int64)))
+
+        for bit in bin(e)[2:]:
+            result = self.mul_array(result, result)
+            if bit == "1":
+                result = self.mul_array(result, x)
+
+        return result
+
+class EisensteinCRT:
+    """
+    Chinese remainder reconstruction modulo pairwise coprime m_1, ..., m_k
+
+    Create the solver once per set of moduli by:
+         C = EisensteinCRT([EisensteinInt(3,1), EisensteinInt(2,0)])
+
+    Setup multiplies the moduli up a product tree to M = m_1 * ... * m_k and
+    walks back down it to every cofactor M_i = M / m_i, O(k) multiplications
+    in all. Then e_i = M_i * (M_i^-1 mod m_i) is 1 modulo m_i and 0 modulo
+    the other moduli, so each reconstruction is x = r_1*e_1 + ... + r_k*e_k
+    reduced modulo M, k multiplications.
+
+    Functions implemented
+         C.solve(residues) - Returns the canonical residue x modulo M with
+            x ≡ residues[i] mod moduli[i].
+         C.solve_array(residues) - Same for k EisensteinArrays, one per
+            modulus, solving each position at once.
+    """
+
+    def __init__(self, moduli):
+        moduli = [EisensteinInt(m) if isinstance(m, int) else m for m in moduli]
+
+        assert(len(moduli) > 0)
+
+        # Product tree, leaves first. An odd node out is carried up as is.
+        tree = [moduli]
+        while len(tree[-1]) > 1:
+            level = tree[-1]
+            tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                         for i in range(0, len(level), 2)])
+
+        # Cofactor of each node: the product of everything outside it
+        cofactors = [ONE]
+        for level in reversed(tree[:-1]):
+            cofactors = [cofactors[i // 2] * level[i ^ 1] if i ^ 1 < len(level) else cofactors[i // 2]
+                         for i in range(len(level))]
+
+        self.moduli = moduli
+        self.modulus = tree[-1][0]
+        self.ring = EisensteinMod(self.modulus)
+
+        self.basis = []
+        for m, cofactor in zip(moduli, cofactors):
+            R = EisensteinMod(m)
+            g, s, t = R.reduce(cofactor).xgcd(m)
+            assert g.is_unit(), "moduli are not pairwise coprime, {} shares a factor".format(m)
+            self.basis.append(self.ring.reduce(cofactor * R.reduce(s * g.conjugate())))
+
+    def solve(self, residues):
+        assert(len(residues) == len(self.basis))
+
+        x = EisensteinInt(0)
+        for r, e in zip(residues, self.basis):
+            x = x + r * e
+
+        return self.ring.reduce(x)
+
+    def solve_array(self, residues):
+        assert(len(residues) == len(self.basis))
+
+        x = residues[0] * self.basis[0]
+        for r, e in zip(residues[1:], self.basis[1:]):
+            x = x + r * e
+
+        return self.ring.reduce_array(x)
+
+def crt(residues, moduli):
+    # One-off reconstruction, keep an EisensteinCRT to reuse the setup
+    return EisensteinCRT(moduli).solve(residues)
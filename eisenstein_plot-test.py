@@ -0,0 +1,43 @@
+import unittest
+import matplotlib
+matplotlib.use("Agg")
+import os
+import tempfile
+from math import isclose, pi
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+from eisenstein_plot import cartesian_coordinates, polar_coordinates, plot_chunks
+
+class EisensteinPlotTest(unittest.TestCase):
+    def test_coordinates(self):
+        points = [EisensteinInt(3,5), EisensteinInt(-2,1), EisensteinInt(0,-4), EisensteinInt(7,0)]
+        a = EisensteinArray.from_list(points)
+
+        x, y = cartesian_coordinates(a)
+        length, angle = polar_coordinates(a)
+        for i, pt in enumerate(points):
+            c = pt.complex_form()
+            self.assertTrue(isclose(x[i], c.real, abs_tol=1e-12))
+            self.assertTrue(isclose(y[i], c.imag, abs_tol=1e-12))
+
+            r, theta = pt.polar_form()
+            self.assertTrue(isclose(length[i], r))
+            self.assertTrue(isclose((angle[i] - theta) % (2*pi), 0, abs_tol=1e-9) or
+                            isclose((angle[i] - theta) % (2*pi), 2*pi, abs_tol=1e-9))
+
+    def test_plot_chunks(self):
+        a = EisensteinInt(2,19)
+        with tempfile.TemporaryDirectory() as directory:
+            # Both the scatter and the density path, from array chunks
+            for max_points in [10**6, 100]:
+                file_name = os.path.join(directory, "chunks-{}.png".format(max_points))
+                plot_chunks(lambda: EisensteinArray.ball_chunks(20, a, 1, 200), 3*20*21, primes=True,
+                            file_name=file_name, highlight=a, max_points=max_points)
+                self.assertTrue(os.path.getsize(file_name) > 0)
+
+            file_name = os.path.join(directory, "multiples.png")
+            a.plot_multiples(n=3, file_name=file_name)
+            self.assertTrue(os.path.getsize(file_name) > 0)
+
+if (__name__ == '__main__'):
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Plots many Eisenstein integers at once.
+
+The coordinates of a whole EisensteinArray are computed in one vectorized
+step and the primes are found in bulk, so each class of points is drawn
+with a single call. Past max_points the points are binned into a 2-D
+histogram instead, a chunk at a time, so time and memory stay bounded.
+
+Functions implemented
+     cartesian_coordinates(points) - Returns the arrays x and y of the
+        complex forms.
+     polar_coordinates(points) - Returns the arrays of radius and angle.
+     plot_point(point, format, label, file_name) - Plots a single point in a
+        polar plane. Shows plot unless given a file name to save to.
+     plot_points(points, primes, labels, file_name, highlight) - Plots the
+        points in a polar plane, in red when prime (or equal to highlight).
+        Shows plot unless given a file name to save to.
+     plot_chunks(chunks, count, ...) - Plots the points of the EisensteinArray
+        chunks yielded by chunks(), as plot_points does, for sets too large
+        to hold at once.
+"""
+
+from math import sqrt
+import numpy as np
+import matplotlib.pyplot as plt
+from eisenstein_array import EisensteinArray
+from eisenstein_primes import is_prime_array, prime_sieve, SIEVE_LIMIT
+
+# Above this many points plot_points draws a density raster
+MAX_POINTS = 20000
+
+# Points binned per step of the density raster
+CHUNK = 1 << 20
+
+def cartesian_coordinates(points):
+    z = points.complex_form()
+    return z.real, z.imag
+
+def polar_coordinates(points):
+    return points.polar_form()
+
+def plot_point(point, format="", label="", file_name=""):
+    length, angle = point.polar_form()
+    max_len = length
+
+    if format != "":
+        plt.polar(angle, length, format)
+    else:
+        plt.polar(angle, length, 'ro')
+
+    if label != "":
+        plt.text(angle, length, label, horizontalalignment='center', verticalalignment='bottom')
+    else:
+        plt.text(angle, length, str(point), horizontalalignment='center', verticalalignment='bottom')
+
+    plt.thetagrids(range(0, 360, 60), ('1', '1+ω', 'ω', '-1', '-ω-1', '-ω'))
+    if max_len > 0:
+        plt.rgrids(np.arange(0,max_len,max_len/10), labels=[])
+
+    if file_name != "":
+        plt.savefig(file_name)
+        plt.clf()
+    else:
+        plt.show()
+
+    return plt
+
+def plot_points(points, primes=False, labels=False, file_name="", highlight=None,
+                max_points=MAX_POINTS, bins=512):
+    if not isinstance(points, EisensteinArray):
+        points = EisensteinArray.from_list(points)
+
+    if len(points) > max_points:
+        chunks = lambda: (points[start:start + CHUNK] for start in range(0, len(points), CHUNK))
+        draw_density(chunks, primes, bins)
+    else:
+        draw_points(points, primes, labels, highlight)
+
+    return finish(file_name)
+
+def plot_chunks(chunks, count, primes=False, labels=False, file_name="", highlight=None,
+                max_points=MAX_POINTS, bins=512, max_norm=None):
+    # chunks() is called once per pass over the points, count is their total.
+    # Passing the largest norm saves the pass that finds it.
+    if count > max_points:
+        draw_density(chunks, primes, bins, max_norm)
+    else:
+        parts = list(chunks())
+        points = EisensteinArray(np.concatenate([p.real for p in parts]), np.concatenate([p.imaginary for p in parts]))
+        draw_points(points, primes, labels, highlight)
+
+    return finish(file_name)
+
+def finish(file_name):
+    if file_name != "":
+        plt.savefig(file_name)
+        plt.clf()
+    else:
+        plt.show()
+
+    return plt
+
+def draw_points(points, primes, labels, highlight):
+    length, angle = polar_coordinates(points)
+
+    red = np.zeros(len(points), dtype=bool)
+    if primes:
+        red |= is_prime_array(points)
+    if highlight is not None:
+        red |= (points.real == highlight.real) & (points.imaginary == highlight.imaginary)
+
+    plt.polar(angle[~red], length[~red], 'bo')
+    plt.polar(angle[red], length[red], 'ro')
+
+    if (labels):
+        for pt, l, a in zip(points.to_list(), length, angle):
+            plt.text(a, l, str(pt), horizontalalignment='center', verticalalignment='bottom')
+
+    max_len = length.max() if len(length) else 0
+
+    plt.thetagrids(range(0, 360, 60), ('1', '1+ω', 'ω', '-1', '-ω-1', '-ω'))
+    if max_len > 0:
+        plt.rgrids(np.arange(0,max_len,max_len/10), labels=[])
+
+def draw_density(chunks, primes, bins, max_norm=None):
+    if max_norm is None:
+        max_norm = 0
+        for chunk in chunks():
+            max_norm = max(max_norm, int(chunk.norm().max()))
+    r = sqrt(max_norm) or 1.0
+    extent = [[-r, r], [-r, r]]
+
+    sieve = None
+    if primes and max_norm <= SIEVE_LIMIT:
+        sieve = prime_sieve(max_norm)
+
+    counts = np.zeros((bins, bins))
+    prime_counts = np.zeros((bins, bins))
+    for chunk in chunks():
+        x, y = cartesian_coordinates(chunk)
+        counts += np.histogram2d(x, y, bins=bins, range=extent)[0]
+        if primes:
+            red = is_prime_array(chunk, sieve)
+            prime_counts += np.histogram2d(x[red], y[red], bins=bins, range=extent)[0]
+
+    plt.imshow(np.log1p(counts.T), origin="lower", extent=(-r, r, -r, r), cmap="Blues")
+    if primes:
+        plt.imshow(np.ma.masked_equal(np.log1p(prime_counts.T), 0), origin="lower",
+                   extent=(-r, r, -r, r), cmap="Reds", alpha=0.8)
+    plt.gca().set_aspect("equal")
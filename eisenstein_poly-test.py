@@ -0,0 +1,104 @@
+import random
+import unittest
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+from eisenstein_poly import EisensteinPoly, convolve, ntt
+import eisenstein_poly
+
+def random_poly(n, bound, rng):
+    return EisensteinPoly([EisensteinInt(rng.randint(-bound, bound), rng.randint(-bound, bound)) for i in range(n)])
+
+def naive_product(f, g):
+    result = [EisensteinInt(0)] * (len(f) + len(g) - 1)
+    for i in range(len(f)):
+        for j in range(len(g)):
+            result[i + j] = result[i + j] + f[i] * g[j]
+    return EisensteinPoly(result)
+
+class PolyTest(unittest.TestCase):
+    def test_basic(self):
+        f = EisensteinPoly([EisensteinInt(3,1), 0, 1, 0, 0])
+        self.assertEqual(f.degree(), 2)
+        self.assertEqual(f[0], EisensteinInt(3,1))
+        self.assertEqual(f[5], EisensteinInt(0))
+        self.assertEqual(str(f), "x^2 + (3 + ω)")
+        self.assertEqual(EisensteinPoly().degree(), -1)
+        self.assertEqual(str(EisensteinPoly()), "0")
+        self.assertEqual(str(EisensteinPoly([EisensteinInt(0,-1), -1, EisensteinInt(-2,1)])),
+                         "-(2 - ω)x^2 - x - ω")
+        self.assertEqual(str(EisensteinPoly([-3, EisensteinInt(0,2), EisensteinInt(0,-1)])), "-ωx^2 + 2ωx - 3")
+
+        g = EisensteinPoly([1, EisensteinInt(0,1)])
+        self.assertEqual(f + g, EisensteinPoly([EisensteinInt(4,1), EisensteinInt(0,1), 1]))
+        self.assertEqual(f - f, EisensteinPoly())
+        self.assertEqual(-g + 1, EisensteinPoly([0, EisensteinInt(0,-1)]))
+        self.assertEqual(g * EisensteinInt(0,1), EisensteinPoly([EisensteinInt(0,1), EisensteinInt(-1,-1)]))
+        self.assertEqual(3 * g, EisensteinPoly([3, EisensteinInt(0,3)]))
+
+    def test_product(self):
+        rng = random.Random(24)
+        # Sizes and coefficient bounds covering np.convolve, the NTT with one
+        # to all primes and Karatsuba
+        for n, m, bound in [(1, 1, 5), (5, 3, 10), (40, 70, 1000), (300, 257, 10**6), (200, 300, 10**12),
+                            (100, 120, 10**30), (150, 130, 10**40), (2500, 30, 3)]:
+            f = random_poly(n, bound, rng)
+            g = random_poly(m, bound, rng)
+            self.assertEqual(f * g, naive_product(f, g))
+
+        x = EisensteinPoly([0, 1])
+        self.assertEqual((x + EisensteinInt(0,1)) * (x + EisensteinInt(-1,-1)), x*x - x + 1)
+
+    def test_convolve(self):
+        rng = np.random.default_rng(24)
+        a = rng.integers(-2**40, 2**40, 5000)
+        b = rng.integers(-2**40, 2**40, 3000)
+        self.assertEqual(convolve(a, b).tolist(), np.convolve(a.astype(object), b.astype(object)).tolist())
+
+        a = rng.integers(-10**6, 10**6, 3000)
+        self.assertEqual(convolve(a, a).tolist(), np.convolve(a, a).tolist())
+
+    def test_ntt(self):
+        p, g = eisenstein_poly.NTT_PRIMES[0]
+        x = np.arange(16, dtype=np.int64)
+        self.assertEqual(ntt(ntt(x.copy(), p, g), p, g, inverse=True).tolist(), x.tolist())
+
+    def test_divmod(self):
+        rng = random.Random(7)
+        for n, m in [(10, 3), (50, 20), (5, 5), (3, 6)]:
+            f = random_poly(n, 100, rng)
+            g = random_poly(m - 1, 100, rng) + EisensteinPoly([0] * (m - 1) + [1])
+            q, r = divmod(f, g)
+            self.assertEqual(q * g + r, f)
+            self.assertLess(r.degree(), g.degree())
+            self.assertEqual(f // g, q)
+            self.assertEqual(f % g, r)
+
+        self.assertRaises(AssertionError, divmod, EisensteinPoly([1, 2]), EisensteinPoly([1, 2]))
+
+    def test_evaluate(self):
+        f = EisensteinPoly([EisensteinInt(1,2), 3, EisensteinInt(0,-4), 1])
+        points = list(EisensteinInt.hex_disk(3))
+        values = [f[0] + f[1]*x + f[2]*x*x + f[3]*x*x*x for x in points]
+        self.assertEqual([f(x) for x in points], values)
+        self.assertEqual(f(EisensteinArray.from_list(points)).to_list(), values)
+        self.assertEqual(f(2), EisensteinInt(15,-14))
+
+    def test_large_product(self):
+        # Long enough for the NTT with several primes, checked at points and
+        # at a coefficient against the schoolbook sum. Timing is left to the
+        # poly_mul benchmark.
+        n = 5000
+        rng = np.random.default_rng(5)
+        f = EisensteinPoly(EisensteinArray(rng.integers(-10**6, 10**6, n), rng.integers(-10**6, 10**6, n)))
+        g = EisensteinPoly(EisensteinArray(rng.integers(-10**6, 10**6, n), rng.integers(-10**6, 10**6, n)))
+        h = f * g
+
+        for x in [EisensteinInt(1,1), EisensteinInt(0,-1)]:
+            self.assertEqual(h(x), f(x) * g(x))
+        k = 3210
+        expected = sum((f[i] * g[k - i] for i in range(k + 1)), EisensteinInt(0))
+        self.assertEqual(h[k], expected)
+
+if (__name__ == '__main__'):
+    unittest.main()
@@ -0,0 +1,387 @@
+"""
+Polynomials with Eisenstein integer coefficients.
+
+A polynomial is stored as A(x) + B(x)ω with integer polynomials A and B,
+held as the coefficient arrays of an EisensteinArray, lowest degree first.
+Since ω^2 = -1 - ω,
+     (A + Bω)(C + Dω) = (AC - BD) + ((A+B)(C+D) - AC - 2BD)ω
+so one product takes three integer products, each computed by convolve():
+     np.convolve   products that fit in int64, below NTT_THRESHOLD terms
+     NTT           a number theoretic transform modulo as many of NTT_PRIMES
+                   as the coefficient bound needs, put back together by CRT
+     Karatsuba     coefficients too large for the NTT primes, on python ints
+                   down to KARATSUBA_THRESHOLD terms
+All paths are exact.
+
+Create the polynomial by:
+     f = EisensteinPoly([EisensteinInt(3,1), 0, 1])  # x^2 + (3 + ω)
+
+Functions implemented
+     Basic functions: init(), ==, str(), len(), []
+     Arithmetic functions: +, *, -, unary -, divmod(), //, % (the divisor
+        must be monic)
+
+     f.degree() - Returns the degree, -1 for the zero polynomial.
+     f(x) - Returns the value at an EisensteinInt, or at each element of an
+        EisensteinArray.
+     convolve(a, b) - Returns the product of integer polynomials given as
+        coefficient arrays.
+"""
+
+from math import prod
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray, INT64_MAX
+
+# Karatsuba hands operands of at most this many terms to np.convolve
+KARATSUBA_THRESHOLD = 64
+
+# Products fitting in int64 use the NTT once the shorter operand has this many
+# terms, np.convolve below. Larger products use it from KARATSUBA_THRESHOLD.
+NTT_THRESHOLD = 2048
+
+# (p, g): primes p = c*2^k + 1 below 2^31 with k >= 23 and a primitive root g.
+# Products of two residues fit in int64.
+NTT_PRIMES = ((998244353, 3), (167772161, 3), (469762049, 3), (754974721, 11),
+              (2013265921, 31), (1811939329, 13), (2113929217, 5))
+NTT_MAX_LENGTH = 1 << 23
+NTT_MODULUS = prod(p for p, g in NTT_PRIMES)
+
+def max_abs(array):
+    return EisensteinArray.max_abs(array)
+
+def schoolbook(a, b):
+    # np.convolve, on python ints when the result can overflow int64
+    a, b = EisensteinArray.widen(min(len(a), len(b)) * max_abs(a) * max_abs(b), a, b)
+    if a.dtype != b.dtype:
+        a, b = a.astype(object), b.astype(object)
+    return np.convolve(a, b)
+
+def karatsuba(a, b):
+    # a and b of the same length n, returns the 2n-1 coefficients of a*b
+    n = len(a)
+    if n <= KARATSUBA_THRESHOLD:
+        return schoolbook(a, b)
+
+    h = n // 2
+    a0, a1 = a[:h], a[h:]
+    b0, b1 = b[:h], b[h:]
+
+    # a0 and b0 are padded to the length of a1 and b1 for the middle product
+    m = n - h
+    s = np.zeros(m, dtype=a.dtype)
+    t = np.zeros(m, dtype=b.dtype)
+    s[:h] = a0
+    s += a1
+    t[:h] = b0
+    t += b1
+
+    z0 = karatsuba(a0, b0)
+    z2 = karatsuba(a1, b1)
+    z1 = karatsuba(s, t)
+    z1[:len(z0)] -= z0
+    z1[:len(z2)] -= z2
+
+    result = np.zeros(2*n - 1, dtype=z1.dtype)
+    result[:len(z0)] += z0
+    result[h:h + len(z1)] += z1
+    result[2*h:2*h + len(z2)] += z2
+    return result
+
+def ntt(x, p, g, inverse=False):
+    # In-place transform of x, whose length n is a power of 2, modulo p.
+    # Forward: decimation in frequency, natural order in and bit reversed
+    # order out. Inverse: decimation in time back from bit reversed order,
+    # scaled by 1/n. A product needs no bit reversal in between.
+
+    n = len(x)
+    w = pow(g, (p - 1) // n, p)
+    if inverse:
+        w = pow(w, p - 2, p)
+
+    # roots[j] = w^j for j < n/2, doubling the table each step
+    roots = np.ones(max(n // 2, 1), dtype=np.int64)
+    m = 1
+    while m < n // 2:
+        roots[m:2*m] = roots[:m] * pow(w, m, p) % p
+        m *= 2
+
+    lengths = [n >> i for i in range(n.bit_length() - 1)]
+    if inverse:
+        lengths.reverse()
+
+    for length in lengths:
+        half = length // 2
+        blocks = x.reshape(n // length, length)
+        twiddles = roots[::n // length][:half]
+        u = blocks[:, :half].copy()
+        v = blocks[:, half:].copy()
+        if inverse:
+            v = v * twiddles % p
+            blocks[:, :half] = (u + v) % p
+            blocks[:, half:] = (u - v) % p
+        else:
+            blocks[:, :half] = (u + v) % p
+            blocks[:, half:] = (u - v) * twiddles % p
+
+    if inverse:
+        x[:] = x * pow(n, p - 2, p) % p
+    return x
+
+def ntt_convolve(a, b, bound):
+    # a*b through the NTT modulo enough primes that their product exceeds
+    # 2*bound, then CRT (Garner's mixed radix form) to the signed result
+
+    n = 1 << (len(a) + len(b) - 2).bit_length()
+
+    primes = []
+    modulus = 1
+    for p, g in NTT_PRIMES:
+        if modulus > 2*bound:
+            break
+        primes.append((p, g))
+        modulus *= p
+    assert modulus > 2*bound
+
+    residues = []
+    for p, g in primes:
+        x = np.zeros(n, dtype=np.int64)
+        y = np.zeros(n, dtype=np.int64)
+        x[:len(a)] = (a % p).astype(np.int64)
+        y[:len(b)] = (b % p).astype(np.int64)
+        ntt(x, p, g)
+        ntt(y, p, g)
+        residues.append(ntt(x * y % p, p, g, inverse=True)[:len(a) + len(b) - 1])
+
+    # digits[i] with result = digits[0] + digits[1]*p0 + digits[2]*p0*p1 + ...
+    digits = []
+    for i, (p, g) in enumerate(primes):
+        t = residues[i]
+        for j in range(i):
+            q = primes[j][0]
+            t = (t - digits[j]) % p * pow(q, p - 2, p) % p
+        digits.append(t)
+
+    if modulus <= INT64_MAX:
+        result = digits[-1]
+        for j in range(len(primes) - 2, -1, -1):
+            result = result * primes[j][0] + digits[j]
+    else:
+        result = digits[-1].astype(object)
+        for j in range(len(primes) - 2, -1, -1):
+            result = result * primes[j][0] + digits[j].astype(object)
+
+    return np.where(result > modulus // 2, result - modulus, result)
+
+def convolve(a, b):
+    a = EisensteinArray.coefficients(a)
+    b = EisensteinArray.coefficients(b)
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    n = min(len(a), len(b))
+    bound = n * max_abs(a) * max_abs(b)
+    if n < (NTT_THRESHOLD if bound <= INT64_MAX else KARATSUBA_THRESHOLD):
+        return EisensteinArray.coefficients(schoolbook(a, b))
+
+    if 2*bound < NTT_MODULUS and len(a) + len(b) - 1 <= NTT_MAX_LENGTH:
+        result = ntt_convolve(a, b, bound)
+    else:
+        # Karatsuba on operands padded to a common length. The middle
+        # products add operands at every level, up to 2^depth times larger.
+        m = max(len(a), len(b))
+        depth = max(m // KARATSUBA_THRESHOLD, 1).bit_length()
+        dtype = np.int64 if bound << (2*depth) <= INT64_MAX else object
+        x = np.zeros(m, dtype=dtype)
+        y = np.zeros(m, dtype=dtype)
+        x[:len(a)] = a
+        y[:len(b)] = b
+        result = karatsuba(x, y)[:len(a) + len(b) - 1]
+
+    return EisensteinArray.coefficients(result)
+
+class EisensteinPoly:
+    def __init__(self, coefficients=()):
+        if isinstance(coefficients, EisensteinArray):
+            array = coefficients
+        else:
+            array = EisensteinArray.from_list([EisensteinInt(c) if isinstance(c, int) else c for c in coefficients])
+
+        # Trailing zeros dropped, so the last coefficient is the leading one
+        nonzero = np.flatnonzero((array.real != 0) | (array.imaginary != 0))
+        self.coefficients = array[:nonzero[-1] + 1] if len(nonzero) else array[:0]
+
+    @staticmethod
+    def from_arrays(real, imaginary):
+        return EisensteinPoly(EisensteinArray(real, imaginary))
+
+    def degree(self):
+        return len(self.coefficients) - 1
+
+    def __len__(self):
+        return len(self.coefficients)
+
+    def __getitem__(self, i):
+        if 0 <= i < len(self.coefficients):
+            return self.coefficients[i]
+        return EisensteinInt(0)
+
+    def __eq__(self, other):
+        if isinstance(other, (int, EisensteinInt)):
+            other = EisensteinPoly([other])
+        if not isinstance(other, EisensteinPoly):
+            return False
+        return self.coefficients.to_list() == other.coefficients.to_list()
+
+    def __str__(self):
+        # Terms from the highest degree. A coefficient with both parts is
+        # parenthesized, and a leading minus becomes the joining " - ".
+        text = ""
+        for i in range(self.degree(), -1, -1):
+            c = self.coefficients[i]
+            if c == EisensteinInt(0):
+                continue
+
+            negative = c.real < 0 or (c.real == 0 and c.imaginary < 0)
+            if negative:
+                c = -c
+
+            power = "" if i == 0 else "x" if i == 1 else "x^{}".format(i)
+            if c.real != 0 and c.imaginary != 0:
+                coefficient = "({})".format(c)
+            elif i > 0 and c == EisensteinInt(1):
+                coefficient = ""
+            else:
+                coefficient = str(c)
+
+            if text:
+                text += " - " if negative else " + "
+            elif negative:
+                text = "-"
+            text += coefficient + power
+        return text or "0"
+
+    @staticmethod
+    def operand(other):
+        if isinstance(other, EisensteinPoly):
+            return other
+        if isinstance(other, (int, EisensteinInt)):
+            return EisensteinPoly([other])
+        return None
+
+    def __add__(self, other):
+        other = EisensteinPoly.operand(other)
+        if other is None:
+            return NotImplemented
+
+        n = max(len(self), len(other))
+        x = self.padded(n)
+        y = other.padded(n)
+        return EisensteinPoly(x + y)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __neg__(self):
+        return EisensteinPoly(-self.coefficients)
+
+    def __sub__(self, other):
+        other = EisensteinPoly.operand(other)
+        if other is None:
+            return NotImplemented
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def padded(self, n):
+        # The coefficients as an EisensteinArray of length n
+        real = np.zeros(n, dtype=self.coefficients.real.dtype)
+        imaginary = np.zeros(n, dtype=self.coefficients.imaginary.dtype)
+        real[:len(self)] = self.coefficients.real
+        imaginary[:len(self)] = self.coefficients.imaginary
+        return EisensteinArray(real, imaginary)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, EisensteinInt)):
+            return EisensteinPoly(self.coefficients * other)
+        if not isinstance(other, EisensteinPoly):
+            return NotImplemented
+
+        if len(self) == 0 or len(other) == 0:
+            return EisensteinPoly()
+
+        # (A + Bω)(C + Dω) = (AC - BD) + ((A+B)(C+D) - AC - 2BD)ω
+        a = self.coefficients.real
+        b = self.coefficients.imaginary
+        c = other.coefficients.real
+        d = other.coefficients.imaginary
+        a, b = EisensteinArray.widen(2 * self.coefficients.bound(), a, b)
+        c, d = EisensteinArray.widen(2 * other.coefficients.bound(), c, d)
+
+        ac = convolve(a, c)
+        bd = convolve(b, d)
+        mixed = convolve(a + b, c + d)
+
+        ac, bd, mixed = EisensteinArray.widen(max_abs(mixed) + 3*max(max_abs(ac), max_abs(bd)), ac, bd, mixed)
+        return EisensteinPoly.from_arrays(ac - bd, mixed - ac - 2*bd)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __divmod__(self, other):
+        # Long division, one leading term of the remainder per step. The
+        # divisor is monic, so every quotient coefficient is a remainder
+        # coefficient and the division stays in Z[ω][x].
+        other = EisensteinPoly.operand(other)
+        if other is None:
+            return NotImplemented
+
+        assert other.degree() >= 0 and other[other.degree()] == EisensteinInt(1), "divisor must be monic"
+
+        m = other.degree()
+        n = self.degree()
+        if n < m:
+            return EisensteinPoly(), self
+
+        # Object arrays of python ints, the remainder coefficients can grow
+        # beyond int64
+        rr = self.coefficients.real.astype(object)
+        ri = self.coefficients.imaginary.astype(object)
+        dr = other.coefficients.real[:m].astype(object)
+        di = other.coefficients.imaginary[:m].astype(object)
+        qr = np.zeros(n - m + 1, dtype=object)
+        qi = np.zeros(n - m + 1, dtype=object)
+        for i in range(n - m, -1, -1):
+            a = rr[i + m]
+            b = ri[i + m]
+            qr[i] = a
+            qi[i] = b
+            if a == 0 and b == 0:
+                continue
+            # (a+bω)(c+dω) = (ac-bd) + (ad+b(c-d))ω
+            rr[i:i + m] -= a*dr - b*di
+            ri[i:i + m] -= a*di + b*(dr - di)
+
+        quotient = EisensteinArray(qr, qi)
+        remainder = EisensteinArray(rr[:m], ri[:m])
+        return EisensteinPoly(quotient), EisensteinPoly(remainder)
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def __call__(self, x):
+        # Horner's rule, vectorized over an EisensteinArray of points
+        if isinstance(x, EisensteinArray):
+            result = EisensteinArray(np.zeros(len(x), dtype=np.int64))
+        else:
+            if isinstance(x, int):
+                x = EisensteinInt(x)
+            result = EisensteinInt(0)
+
+        for c in reversed(self.coefficients.to_list()):
+            result = result * x + c
+        return result
@@ -0,0 +1,83 @@
+import unittest
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+from eisenstein_primes import prime_sieve, classify, eisenstein_primes, iter_eisenstein_primes, is_prime_array
+from eisenstein_primes import segment_sieve, parallel_eisenstein_primes, parallel_is_prime
+
+class EisensteinPrimesTest(unittest.TestCase):
+    def brute_force(self, max_norm):
+        # Every prime in the first sextant (a > b >= 0) within the norm bound
+        primes = set()
+        for r in range(1, max_norm + 1):
+            for i in range(0, r):
+                e = EisensteinInt(r, i)
+                if e.norm() <= max_norm and e.is_prime():
+                    primes.add(e)
+        return primes
+
+    def test_prime_sieve(self):
+        sieve = prime_sieve(30)
+        self.assertEqual([p for p in range(31) if sieve[p]], [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+
+    def test_classify(self):
+        self.assertEqual(classify(2), "inert")
+        self.assertEqual(classify(3), "ramified")
+        self.assertEqual(classify(7), "split")
+        self.assertEqual(classify(11), "inert")
+
+    def test_canonical_primes(self):
+        primes = eisenstein_primes(49).to_list()
+        self.assertEqual(primes[:4], [EisensteinInt(2,1), EisensteinInt(2,0), EisensteinInt(3,1), EisensteinInt(3,2)])
+        self.assertEqual(set(primes), self.brute_force(49))
+        self.assertEqual(len(primes), len(set(primes)))
+
+        norms = [p.norm() for p in primes]
+        self.assertEqual(norms, sorted(norms))
+
+    def test_empty_bound(self):
+        for max_norm in (-5, -1, 0, 1, 2):
+            self.assertEqual(eisenstein_primes(max_norm).to_list(), [])
+            self.assertEqual(eisenstein_primes(max_norm, canonical=False).to_list(), [])
+        self.assertEqual(eisenstein_primes(3).to_list(), [EisensteinInt(2,1)])
+
+    def test_all_primes(self):
+        primes = eisenstein_primes(40, canonical=False).to_list()
+        associates = [a for p in self.brute_force(40) for a in p.associates()]
+        self.assertEqual(set(primes), set(associates))
+        self.assertEqual(len(primes), len(set(primes)))
+        self.assertEqual(primes[:6], EisensteinInt(2,1).associates())
+
+    def test_generator(self):
+        self.assertEqual(list(iter_eisenstein_primes(100)), eisenstein_primes(100).to_list())
+
+    def test_is_prime_array(self):
+        points = EisensteinArray.hex_disk(12)
+        expected = [p.is_prime() for p in points.to_list()]
+        self.assertEqual(is_prime_array(points).tolist(), expected)
+        self.assertEqual(is_prime_array(points, prime_sieve(500)).tolist(), expected)
+
+        big = EisensteinArray.from_list([EisensteinInt(2**70 + 3, 5), EisensteinInt(10**12 + 39, 0), EisensteinInt(7,3)])
+        self.assertEqual(is_prime_array(big).tolist(), [p.is_prime() for p in big.to_list()])
+
+    def test_segment_sieve(self):
+        sieve = prime_sieve(2000)
+        for start, stop in [(0, 2000), (0, 3), (1000, 2001), (1999, 2001)]:
+            self.assertEqual(segment_sieve(start, stop).tolist(), sieve[start:stop].tolist())
+
+    def test_parallel_primes(self):
+        expected = eisenstein_primes(20000).to_list()
+        for workers in [1, 2]:
+            shards = list(parallel_eisenstein_primes(20000, workers=workers, shard_size=3001))
+            self.assertEqual(len(shards), 7)
+            self.assertEqual([x for shard in shards for x in shard.to_list()], expected)
+
+        shards = parallel_eisenstein_primes(500, canonical=False, workers=1, shard_size=64)
+        self.assertEqual([x for shard in shards for x in shard.to_list()], eisenstein_primes(500, canonical=False).to_list())
+
+    def test_parallel_is_prime(self):
+        points = EisensteinArray.hex_disk(60)
+        self.assertEqual(parallel_is_prime(points, workers=2, chunk_size=1000).tolist(), is_prime_array(points).tolist())
+        self.assertEqual(len(parallel_is_prime(EisensteinArray(), workers=1)), 0)
+
+if (__name__ == '__main__'):
+    unittest.main()
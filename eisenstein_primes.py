@@ -0,0 +1,227 @@
+"""
+Enumerates Eisenstein primes up to a norm bound from one sieve of the
+rational primes.
+
+Every rational prime p falls in one of three classes:
+     inert     p ≡ 2 mod 3   p stays prime in Z[ω], its norm is p^2
+     ramified  p = 3         3 = -ω^2(1-ω)^2, the prime 1-ω has norm 3
+     split     p ≡ 1 mod 3   p = π * conjugate(π), both of norm p
+
+Functions implemented
+     prime_sieve(n) - Returns a boolean array, whether each of 0..n is prime.
+     classify(p) - Returns "inert", "ramified" or "split" for a rational prime.
+     eisenstein_primes(max_norm, canonical) - Returns an EisensteinArray of
+        the Eisenstein primes with norm <= max_norm, sorted by norm.
+     iter_eisenstein_primes(max_norm, canonical) - Yields the same primes
+        as EisensteinInt.
+     is_prime_array(points, sieve) - Returns a boolean array, whether each element
+        of an EisensteinArray passes EisensteinInt.is_prime(). Also available
+        as EisensteinArray.is_prime().
+
+     segment_sieve(start, stop) - Returns a boolean array, whether each of
+        start..stop-1 is prime.
+     shard_primes(start, stop) - Returns the canonical primes with
+        start <= norm < stop.
+     parallel_eisenstein_primes(max_norm, canonical, workers, shard_size) -
+        Yields the primes of eisenstein_primes() as one EisensteinArray per
+        norm shard, in norm order, computed on a process pool.
+     parallel_is_prime(points, workers, chunk_size) - Returns is_prime_array()
+        of a large EisensteinArray, computed in chunks on a process pool.
+
+The parallel functions keep at most two shards per worker in flight, so
+memory stays bounded however far the consumer is behind. workers=1 runs
+everything in the calling process.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import isqrt
+import numpy as np
+from eisenstein import EisensteinInt
+from eisenstein_array import EisensteinArray
+
+# Largest norm looked up in a sieve by is_prime_array, larger norms go to
+# EisensteinInt.is_prime_norm
+SIEVE_LIMIT = 10**8
+
+# Default norms per shard and elements per chunk of the parallel functions
+SHARD_SIZE = 10**7
+CHUNK_SIZE = 10**6
+
+def prime_sieve(n):
+    # Sieve of Eratosthenes over 0..n
+
+    sieve = np.ones(max(n + 1, 2), dtype=bool)
+    sieve[:2] = False
+    for p in range(2, isqrt(n) + 1):
+        if sieve[p]:
+            sieve[p*p::p] = False
+    return sieve[:n + 1]
+
+def classify(p):
+    if p == 3:
+        return "ramified"
+    elif p % 3 == 1:
+        return "split"
+    else:
+        return "inert"
+
+def canonical_primes(max_norm):
+    # Returns the real and imaginary coefficients of the primes in the first
+    # sextant (a > b >= 0), sorted by norm
+
+    # A negative bound has no primes, like an empty norm_disk
+    max_norm = max(max_norm, 0)
+    sieve = prime_sieve(max_norm)
+
+    # Inert: p itself, of norm p^2
+    rational = np.flatnonzero(sieve[:isqrt(max_norm) + 1])
+    inert = rational[rational % 3 == 2]
+    reals = [inert]
+    imags = [np.zeros_like(inert)]
+
+    # Ramified and split: the first sextant points whose norm is a rational
+    # prime, read off the sieve one row b at a time
+    b = 0
+    while b*b + b + 1 <= max_norm:
+        a_max = (b + isqrt(4*max_norm - 3*b*b)) // 2
+        a = np.arange(b + 1, a_max + 1, dtype=np.int64)
+        norms = a*a - a*b + b*b
+        a = a[sieve[norms]]
+        reals.append(a)
+        imags.append(np.full_like(a, b))
+        b += 1
+
+    real = np.concatenate(reals).astype(np.int64)
+    imag = np.concatenate(imags).astype(np.int64)
+
+    order = np.lexsort((imag, real, real*real - real*imag + imag*imag))
+    return real[order], imag[order]
+
+def eisenstein_primes(max_norm, canonical=True):
+    real, imag = canonical_primes(max_norm)
+
+    primes = EisensteinArray(real, imag)
+
+    if not canonical:
+        # Each prime followed by its associates, in the order of units()
+        return primes.associates()
+
+    return primes
+
+def iter_eisenstein_primes(max_norm, canonical=True):
+    primes = eisenstein_primes(max_norm, canonical)
+    for r, i in zip(primes.real.tolist(), primes.imaginary.tolist()):
+        yield EisensteinInt(r, i)
+
+def is_prime_array(points, sieve=None):
+    # Same rule as EisensteinInt.is_prime_norm, with one sieve (or one
+    # is_prime_norm per distinct norm) for the whole array. A sieve from
+    # prime_sieve() can be passed in to share it between calls.
+
+    norms = points.norm()
+
+    if len(norms) == 0:
+        return np.zeros(0, dtype=bool)
+
+    limit = max(int(norms.max()), 0)
+
+    if sieve is None and limit <= SIEVE_LIMIT and norms.dtype != object:
+        sieve = prime_sieve(limit)
+
+    if sieve is None or limit >= len(sieve):
+        distinct, inverse = np.unique(norms, return_inverse=True)
+        prime = [EisensteinInt.is_prime_norm(int(n)) for n in distinct]
+        return np.array(prime, dtype=bool)[inverse.ravel()]
+
+    # 1) Norm(n) = p is prime where p=3 or p≡1 mod 3
+    # 2) Norm(n) = p^2 where p is prime and p≡2 mod 3
+    norms = np.maximum(norms, 0)
+    root = EisensteinArray.isqrt(norms)
+    inert = (root*root == norms) & (root % 3 == 2) & sieve[root]
+
+    return np.asarray(sieve[norms] | inert, dtype=bool)
+
+def segment_sieve(start, stop):
+    # Sieve of Eratosthenes over start..stop-1, crossing off the multiples
+    # of the primes up to isqrt(stop - 1)
+
+    start = max(start, 0)
+    sieve = np.ones(max(stop - start, 0), dtype=bool)
+    if len(sieve) == 0:
+        return sieve
+
+    for p in np.flatnonzero(prime_sieve(isqrt(stop - 1))).tolist():
+        first = max(p*p, (start + p - 1) // p * p)
+        sieve[first - start::p] = False
+    sieve[:max(2 - start, 0)] = False
+    return sieve
+
+def shard_primes(start, stop):
+    # Returns the real and imaginary coefficients of the canonical primes
+    # with start <= norm < stop, sorted like canonical_primes()
+
+    start = max(start, 0)
+    if stop <= start:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    sieve = segment_sieve(start, stop)
+
+    # Ramified and split: the canonical points whose norm is a rational prime
+    real, imag = EisensteinArray.shell(start, stop, sort=False)
+    norms = real*real - real*imag + imag*imag
+    prime = sieve[norms - start]
+    real = real[prime]
+    imag = imag[prime]
+
+    # Inert: p itself, of norm p^2
+    rational = np.arange(isqrt(start - 1) + 1 if start > 0 else 0, isqrt(stop - 1) + 1, dtype=np.int64)
+    rational = rational[prime_sieve(isqrt(stop - 1))[rational] & (rational % 3 == 2)]
+
+    real = np.concatenate((real, rational)).astype(np.int64)
+    imag = np.concatenate((imag, np.zeros_like(rational))).astype(np.int64)
+
+    order = np.lexsort((imag, real, real*real - real*imag + imag*imag))
+    return real[order], imag[order]
+
+def ordered_map(function, tasks, workers=None):
+    # Yields function(*task) for each task in order. Up to two tasks per
+    # worker run ahead on a process pool, the rest wait to be submitted.
+
+    if workers == 1:
+        for task in tasks:
+            yield function(*task)
+        return
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(pool.submit(function, *task))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # The consumer stopped early
+            for future in pending:
+                future.cancel()
+
+def parallel_eisenstein_primes(max_norm, canonical=True, workers=None, shard_size=SHARD_SIZE):
+    shards = ((start, min(start + shard_size, max_norm + 1)) for start in range(0, max_norm + 1, shard_size))
+
+    for real, imag in ordered_map(shard_primes, shards, workers):
+        primes = EisensteinArray(real, imag)
+        if not canonical:
+            primes = primes.associates()
+        yield primes
+
+def parallel_is_prime(points, workers=None, chunk_size=CHUNK_SIZE):
+    chunks = ((points[i:i + chunk_size],) for i in range(0, len(points), chunk_size))
+
+    results = list(ordered_map(is_prime_array, chunks, workers))
+    if not results:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate(results)
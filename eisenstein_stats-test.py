@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import eisenstein
+import eisenstein_stats
+from eisenstein import EisensteinInt
+from eisenstein_stats import instrument
+
+class EisensteinStatsTest(unittest.TestCase):
+    def test_counts(self):
+        a = EisensteinInt(12,3)
+        b = EisensteinInt(4,5)
+        with instrument() as stats:
+            a.gcd(b)
+            a.gcd(b)
+            a.norm()
+
+        self.assertEqual(stats.calls["gcd"], 2)
+        self.assertGreaterEqual(stats.calls["norm"], 1)
+        self.assertGreater(stats.seconds["gcd"], 0)
+        self.assertGreater(stats.allocations, 0)
+
+        summary = stats.summary()
+        self.assertEqual(summary["gcd"]["calls"], 2)
+        self.assertEqual(summary["gcd"]["steps"], 2 * stats.gcd_steps.most_common(1)[0][0])
+        self.assertEqual(summary["gcd"]["norm_bits_histogram"], {str(max(a.norm(), b.norm()).bit_length()): 2})
+        self.assertEqual(json.loads(stats.to_json()), summary)
+
+    def test_generators(self):
+        # ring() and ball() do their work as they are consumed, and that is
+        # the time they record
+        with instrument() as stats:
+            points = list(EisensteinInt(2,1).ball(20))
+
+        self.assertEqual(len(points), 3*20*21 + 1)
+        self.assertEqual(stats.calls["ball"], 1)
+        self.assertEqual(stats.calls["ring"], 21)
+        self.assertGreaterEqual(stats.seconds["ring"], stats.seconds["__add__"])
+        self.assertGreaterEqual(stats.seconds["ball"], stats.seconds["ring"])
+
+    def test_generator_outlives_block(self):
+        # Generators made while enabled can still be consumed afterwards
+        with instrument() as stats:
+            ring = EisensteinInt(2,1).ring(3)
+            disk = EisensteinInt.hex_disk(2)
+
+        self.assertEqual(list(ring), list(EisensteinInt(2,1).ring(3)))
+        self.assertEqual(len(list(disk)), 19)
+        self.assertEqual(stats.calls["ring"], 1)
+        self.assertEqual(stats.calls["hex_disk"], 1)
+        self.assertGreater(stats.seconds["ring"], 0)
+
+    def test_gcd_counts_exact(self):
+        # The norms gcd() computes itself, replayed by hand, and nothing more
+        a = EisensteinInt(12,3)
+        b = EisensteinInt(4,5)
+        with instrument() as stats:
+            a.gcd(b)
+        with instrument() as replay:
+            x, y = a, b
+            x.norm() < y.norm()
+            while y.norm() > 0:
+                q, r = divmod(x, y)
+                x, y = y, r
+
+        self.assertEqual(stats.calls["norm"], replay.calls["norm"])
+        self.assertEqual(stats.calls["__divmod__"], replay.calls["__divmod__"])
+
+        # Swapped arguments recurse once, still one call
+        with instrument() as stats:
+            b.gcd(a)
+
+        summary = stats.summary()
+        self.assertEqual(summary["methods"]["gcd"]["calls"], 1)
+        self.assertEqual(summary["gcd"]["calls"], 1)
+
+    def test_sympy(self):
+        with instrument() as stats:
+            EisensteinInt(3,1).is_prime()
+            EisensteinInt(12).factor()
+
+        self.assertEqual(stats.calls["is_prime_norm"], 1)
+        self.assertEqual(stats.calls["sympy.isprime"], 0)
+        self.assertEqual(stats.calls["sympy.factorint"], 1)
+
+    def test_restore(self):
+        gcd = vars(EisensteinInt)["gcd"]
+        new = eisenstein._new
+        with instrument():
+            self.assertIsNot(vars(EisensteinInt)["gcd"], gcd)
+            self.assertRaises(AssertionError, eisenstein_stats.enable)
+
+        self.assertIs(vars(EisensteinInt)["gcd"], gcd)
+        self.assertIs(eisenstein._new, new)
+        self.assertIsNone(eisenstein_stats.stats)
+        self.assertEqual(EisensteinInt(3,1) * EisensteinInt(2,-1), EisensteinInt(7,0))
+
+    def test_environment(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "stats.json")
+            code = "from eisenstein import EisensteinInt; EisensteinInt(100,3).gcd(EisensteinInt(7,1))"
+            subprocess.run([sys.executable, "-c", code], check=True,
+                           env=dict(os.environ, EISENSTEIN_STATS=file_name))
+            with open(file_name) as f:
+                summary = json.load(f)
+
+        self.assertEqual(summary["gcd"]["calls"], 1)
+        self.assertEqual(summary["methods"]["gcd"]["calls"], 1)
+
+if (__name__ == '__main__'):
+    unittest.main()
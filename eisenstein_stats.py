@@ -0,0 +1,219 @@
+"""
+Opt-in instrumentation of EisensteinInt.
+
+While enabled, every method of EisensteinInt is replaced by a wrapper that
+counts its calls and adds up its wall time (including nested calls). The
+time of a generator such as ring() is added up while it is consumed. gcd()
+also records how many division steps each call took and the bit length of
+the larger norm it started from. New objects are counted through
+EisensteinInt() and the internal _new(), and sympy's isprime and factorint
+are timed as well. Disabling puts the original methods back, so the hot
+paths run untouched when instrumentation is off.
+
+Use it as a context manager:
+     with instrument() as stats:
+         a.gcd(b)
+     stats.summary()  # or stats.to_json()
+
+or set EISENSTEIN_STATS before importing eisenstein: "1" prints the summary
+to stderr at exit, any other value is a file name to write the JSON to.
+
+Functions implemented
+     instrument() - Context manager that enables instrumentation and yields
+        the Stats.
+     enable() - Enables instrumentation and returns the Stats.
+     disable() - Restores the original methods.
+     enable_from_environment() - Enables instrumentation per EISENSTEIN_STATS.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+import eisenstein
+from eisenstein import EisensteinInt
+
+class Stats:
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.allocations = 0
+        self.gcd_steps = Counter()
+        self.norm_bits = Counter()
+
+    def summary(self):
+        methods = {}
+        for name in sorted(self.calls):
+            methods[name] = {"calls": self.calls[name], "seconds": self.seconds[name]}
+
+        return {
+            "methods": methods,
+            "allocations": self.allocations,
+            "gcd": {
+                "calls": sum(self.gcd_steps.values()),
+                "steps": sum(k * v for k, v in self.gcd_steps.items()),
+                "steps_histogram": {str(k): v for k, v in sorted(self.gcd_steps.items())},
+                "norm_bits_histogram": {str(k): v for k, v in sorted(self.norm_bits.items())},
+            },
+        }
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+# The Stats being collected and the originals to restore, while enabled
+stats = None
+originals = {}
+
+def timed(name, f):
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            stats.calls[name] += 1
+            stats.seconds[name] += perf_counter() - start
+    return wrapper
+
+def timed_generator(name, f):
+    # A generator does its work while it is consumed, so the time of each
+    # step is added up rather than that of the call creating it. The call
+    # is counted when it is made, into the Stats enabled at that time.
+    def steps(collected, generator):
+        while True:
+            start = perf_counter()
+            try:
+                value = next(generator)
+            except StopIteration:
+                return
+            finally:
+                collected.seconds[name] += perf_counter() - start
+            yield value
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        stats.calls[name] += 1
+        return steps(stats, f(*args, **kwargs))
+    return wrapper
+
+def timed_function(name, f):
+    if inspect.isgeneratorfunction(f):
+        return timed_generator(name, f)
+    return timed(name, f)
+
+def coefficient_norm(x):
+    # The norm from the coefficients, so recording it does not count as a
+    # call of the timed norm()
+    return x.real*x.real - x.real*x.imaginary + x.imaginary*x.imaginary
+
+def timed_gcd(f):
+    # gcd() recurses once to order its arguments, only the outermost call
+    # is counted and timed and records its division steps and norm size
+    depth = [0]
+
+    @functools.wraps(f)
+    def wrapper(a, b):
+        if depth[0] > 0:
+            return f(a, b)
+
+        depth[0] += 1
+        divisions = stats.calls["__divmod__"]
+        start = perf_counter()
+        try:
+            return f(a, b)
+        finally:
+            depth[0] -= 1
+            stats.calls["gcd"] += 1
+            stats.seconds["gcd"] += perf_counter() - start
+            stats.gcd_steps[stats.calls["__divmod__"] - divisions] += 1
+            stats.norm_bits[max(coefficient_norm(a), coefficient_norm(b)).bit_length()] += 1
+    return wrapper
+
+def counted_new(f):
+    @functools.wraps(f)
+    def wrapper(real, imaginary):
+        stats.allocations += 1
+        return f(real, imaginary)
+    return wrapper
+
+def counted_init(f):
+    @functools.wraps(f)
+    def wrapper(self, real=0, imaginary=0):
+        stats.allocations += 1
+        f(self, real, imaginary)
+    return wrapper
+
+def enable():
+    global stats
+
+    assert stats is None, "instrumentation is already enabled"
+    stats = Stats()
+
+    for name, attribute in list(vars(EisensteinInt).items()):
+        if name.startswith("_EisensteinInt__"):
+            continue
+
+        if isinstance(attribute, staticmethod):
+            wrapped = staticmethod(timed_function(name, attribute.__func__))
+        elif name == "__init__":
+            wrapped = counted_init(attribute)
+        elif name == "gcd":
+            wrapped = timed_gcd(attribute)
+        elif callable(attribute):
+            wrapped = timed_function(name, attribute)
+        else:
+            continue
+
+        originals[(EisensteinInt, name)] = attribute
+        setattr(EisensteinInt, name, wrapped)
+
+    originals[(eisenstein, "_new")] = eisenstein._new
+    eisenstein._new = counted_new(eisenstein._new)
+
+    import sympy
+    for name in ("isprime", "factorint"):
+        originals[(sympy, name)] = getattr(sympy, name)
+        setattr(sympy, name, timed("sympy." + name, getattr(sympy, name)))
+
+    return stats
+
+def disable():
+    global stats
+
+    for (owner, name), attribute in originals.items():
+        setattr(owner, name, attribute)
+    originals.clear()
+
+    collected = stats
+    stats = None
+    return collected
+
+@contextmanager
+def instrument():
+    collected = enable()
+    try:
+        yield collected
+    finally:
+        disable()
+
+def enable_from_environment():
+    target = os.environ.get("EISENSTEIN_STATS", "")
+    if target == "" or stats is not None:
+        return
+
+    collected = enable()
+
+    def report():
+        if target == "1":
+            print(collected.to_json(), file=sys.stderr)
+        else:
+            with open(target, "w") as f:
+                f.write(collected.to_json())
+
+    atexit.register(report)